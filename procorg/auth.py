@@ -1,10 +1,14 @@
 """Authentication module for ProcOrg multi-user support."""
 
+import hashlib
+import hmac
 import os
-import pwd
+import threading
+import time
 from functools import wraps
-from typing import Optional, Dict
-from flask import session, request, jsonify
+from typing import Optional, Dict, Tuple
+from flask import g, session, request, jsonify
+from .users import getpwnam
 
 
 class User:
@@ -14,19 +18,91 @@ class User:
         self.username = username
         self.uid = uid
         self.is_root = (uid == 0)
-
-    def to_dict(self) -> Dict:
-        """Convert to dictionary for JSON serialization."""
-        return {
-            'username': self.username,
-            'uid': self.uid,
+        self._dict = {
+            'username': username,
+            'uid': uid,
             'is_root': self.is_root
         }
 
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for JSON serialization.
+
+        Returns the same precomputed dict on every call; treat it as read-only.
+        """
+        return self._dict
+
+
+# Recent successful PAM verifications, so repeat logins skip the (deliberately
+# slow) system password hash: username -> (salt, digest, expiry, user).
+# Only a salted digest of the password is kept, never the password itself.
+_PW_CACHE: Dict[str, Tuple[bytes, bytes, float, User]] = {}
+_PW_CACHE_LOCK = threading.Lock()
+_PW_CACHE_TTL = 300.0  # seconds
+
+
+# python-pam handle shared across logins. python-pam keeps per-conversation
+# state on the handle, so authentications through it are serialized.
+_PAM = None
+_PAM_LOCK = threading.Lock()
+
+
+def _get_pam():
+    """Return the shared python-pam handle, importing pam on first use.
+
+    Must be called with _PAM_LOCK held.
+
+    Raises:
+        ImportError: If python-pam is not installed
+    """
+    global _PAM
+    if _PAM is None:
+        import pam
+        _PAM = pam.pam()
+    return _PAM
+
+
+def _password_digest(salt: bytes, password: str) -> bytes:
+    """Compute the salted digest stored in the verification cache."""
+    return hmac.new(salt, password.encode('utf-8'), hashlib.sha256).digest()
+
+
+def _cached_login(username: str, password: str) -> Optional[User]:
+    """Return the cached User if this password was recently verified."""
+    with _PW_CACHE_LOCK:
+        entry = _PW_CACHE.get(username)
+    if entry is None:
+        return None
+
+    salt, digest, expiry, user = entry
+    if time.monotonic() >= expiry:
+        _forget_login(username)
+        return None
+    if hmac.compare_digest(digest, _password_digest(salt, password)):
+        return user
+    return None
+
+
+def _remember_login(username: str, password: str, user: User) -> None:
+    """Cache a successful verification for _PW_CACHE_TTL seconds."""
+    salt = os.urandom(16)
+    entry = (salt, _password_digest(salt, password), time.monotonic() + _PW_CACHE_TTL, user)
+    with _PW_CACHE_LOCK:
+        _PW_CACHE[username] = entry
+
+
+def _forget_login(username: str) -> None:
+    """Drop any cached verification for a user."""
+    with _PW_CACHE_LOCK:
+        _PW_CACHE.pop(username, None)
+
 
 def authenticate_user(username: str, password: str) -> Optional[User]:
     """Authenticate a user against system PAM.
 
+    Successful verifications are cached for a few minutes (see _PW_CACHE),
+    so a password changed on the system keeps working until the entry
+    expires or the user logs out.
+
     Args:
         username: System username
         password: User password
@@ -34,15 +110,21 @@ def authenticate_user(username: str, password: str) -> Optional[User]:
     Returns:
         User object if authentication succeeds, None otherwise
     """
+    user = _cached_login(username, password)
+    if user is not None:
+        return user
+
     try:
-        import pam
-        p = pam.pam()
+        with _PAM_LOCK:
+            authenticated = _get_pam().authenticate(username, password)
 
-        if p.authenticate(username, password):
+        if authenticated:
             # Get user info
             try:
-                user_info = pwd.getpwnam(username)
-                return User(username=username, uid=user_info.pw_uid)
+                user_info = getpwnam(username)
+                user = User(username=username, uid=user_info.pw_uid)
+                _remember_login(username, password, user)
+                return user
             except KeyError:
                 return None
         else:
@@ -55,7 +137,7 @@ def authenticate_user(username: str, password: str) -> Optional[User]:
         print("         This is INSECURE and should not be used in production!")
 
         try:
-            user_info = pwd.getpwnam(username)
+            user_info = getpwnam(username)
             # In dev mode, accept any password for testing
             # TODO: Remove this in production
             return User(username=username, uid=user_info.pw_uid)
@@ -73,7 +155,7 @@ def get_user_uid(username: str) -> Optional[int]:
         UID if user exists, None otherwise
     """
     try:
-        return pwd.getpwnam(username).pw_uid
+        return getpwnam(username).pw_uid
     except KeyError:
         return None
 
@@ -81,17 +163,21 @@ def get_user_uid(username: str) -> Optional[int]:
 def get_current_user() -> Optional[User]:
     """Get the currently authenticated user from session.
 
+    The User is built once per request and kept on flask.g, so the auth
+    decorators and the route body share the same object.
+
     Returns:
         User object if authenticated, None otherwise
     """
-    if 'user' not in session:
-        return None
+    if 'user' in g:
+        return g.user
 
-    user_data = session['user']
-    return User(
+    user_data = session.get('user')
+    g.user = None if user_data is None else User(
         username=user_data['username'],
         uid=user_data['uid']
     )
+    return g.user
 
 
 def require_auth(f):
@@ -124,6 +210,8 @@ def require_root(f):
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
+        # get_current_user() leaves the User on g, so the route body's own
+        # call is a single attribute load
         user = get_current_user()
         if user is None:
             return jsonify({'error': 'Authentication required'}), 401
@@ -141,8 +229,13 @@ def init_session(user: User) -> None:
     """
     session['user'] = user.to_dict()
     session.permanent = True  # Session persists across browser closes
+    g.user = user
 
 
 def clear_session() -> None:
     """Clear the current session (logout)."""
+    user_data = session.get('user')
+    if user_data:
+        _forget_login(user_data['username'])
     session.clear()
+    g.pop('user', None)
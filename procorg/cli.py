@@ -1,17 +1,66 @@
 """Command-line interface for ProcOrg."""
 
 import click
+import codecs
+import json
 import sys
 import time
 from pathlib import Path
-from .storage import Storage
-from .manager import ProcessManager
-from .scheduler import Scheduler
 
 
-storage = Storage()
-manager = ProcessManager(storage)
-scheduler = Scheduler(storage, manager)
+# Core objects are created on first use so that commands which only touch
+# the registry don't pay for importing the manager/scheduler stack.
+_storage = None
+_manager = None
+_scheduler = None
+
+
+def _lazy_storage():
+    """Return the shared storage, creating it on first use."""
+    global _storage
+    if _storage is None:
+        from .storage import Storage
+        _storage = Storage()
+    return _storage
+
+
+def _lazy_core():
+    """Return the shared (storage, manager) pair, creating it on first use."""
+    global _manager
+    storage = _lazy_storage()
+    if _manager is None:
+        from .manager import ProcessManager
+        _manager = ProcessManager(storage)
+    return storage, _manager
+
+
+def _lazy_scheduler():
+    """Return the shared scheduler, creating it on first use."""
+    global _scheduler
+    if _scheduler is None:
+        from .scheduler import Scheduler
+        storage, manager = _lazy_core()
+        _scheduler = Scheduler(storage, manager)
+    return _scheduler
+
+
+def _log_watcher(directory: Path):
+    """Return an inotify watch on a process log directory, or None.
+
+    Uses the optional inotify_simple package; callers fall back to polling
+    when it is not installed or the platform has no inotify.
+    """
+    try:
+        from inotify_simple import INotify, flags
+    except ImportError:
+        return None
+
+    try:
+        watcher = INotify()
+        watcher.add_watch(str(directory), flags.MODIFY | flags.CREATE)
+        return watcher
+    except OSError:
+        return None
 
 
 @click.group()
@@ -27,6 +76,7 @@ def cli():
 @click.option('--description', default='', help='Description of the process')
 def register(name, script_path, cron, description):
     """Register a new process."""
+    storage = _lazy_storage()
     script_path = Path(script_path).absolute()
     storage.register_process(name, str(script_path), cron, description)
     click.echo(f"Process '{name}' registered successfully")
@@ -35,10 +85,63 @@ def register(name, script_path, cron, description):
         click.echo(f"Scheduled with cron expression: {cron}")
 
 
+@cli.command()
+@click.argument('manifest', type=click.Path(exists=True, dir_okay=False))
+def register_batch(manifest):
+    """Register many processes from a JSON or YAML manifest.
+
+    The manifest is a list of objects with 'name' and 'script_path' keys
+    and optional 'cron' and 'description' keys. Relative script paths are
+    resolved against the manifest's directory.
+    """
+    storage = _lazy_storage()
+    manifest_path = Path(manifest)
+
+    try:
+        if manifest_path.suffix in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                click.echo("PyYAML is required for YAML manifests (pip install pyyaml)", err=True)
+                sys.exit(1)
+            entries = yaml.safe_load(manifest_path.read_text())
+        else:
+            entries = json.loads(manifest_path.read_text())
+    except Exception as e:
+        click.echo(f"Could not parse manifest: {e}", err=True)
+        sys.exit(1)
+
+    if not isinstance(entries, list):
+        click.echo("Manifest must contain a list of processes", err=True)
+        sys.exit(1)
+
+    processes = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not entry.get('name') or not entry.get('script_path'):
+            click.echo(f"Entry {index}: 'name' and 'script_path' are required", err=True)
+            sys.exit(1)
+
+        script_path = (manifest_path.parent / entry['script_path']).absolute()
+        if not script_path.exists():
+            click.echo(f"Entry {index} ('{entry['name']}'): script not found: {script_path}", err=True)
+            sys.exit(1)
+
+        processes.append({
+            'name': entry['name'],
+            'script_path': str(script_path),
+            'cron_expr': entry.get('cron', entry.get('cron_expr')),
+            'description': entry.get('description', '')
+        })
+
+    count = storage.register_processes(processes)
+    click.echo(f"Registered {count} processes from {manifest}")
+
+
 @cli.command()
 @click.argument('name')
 def unregister(name):
     """Remove a process from the registry."""
+    storage = _lazy_storage()
     if storage.unregister_process(name):
         click.echo(f"Process '{name}' unregistered successfully")
     else:
@@ -46,9 +149,10 @@ def unregister(name):
         sys.exit(1)
 
 
-@cli.command()
-def list():
+@cli.command(name='list')
+def list_processes():
     """List all registered processes."""
+    storage, manager = _lazy_core()
     processes = storage.list_processes()
 
     if not processes:
@@ -73,6 +177,7 @@ def list():
 @click.argument('args', nargs=-1, required=False)
 def run(name, args):
     """Manually run a process with optional arguments."""
+    _, manager = _lazy_core()
     if args:
         click.echo(f"Starting process '{name}' with args: {' '.join(args)}")
     else:
@@ -94,6 +199,7 @@ def run(name, args):
 @click.argument('name')
 def stop(name):
     """Stop a running process."""
+    _, manager = _lazy_core()
     click.echo(f"Stopping process '{name}'...")
 
     if manager.stop_process(name):
@@ -106,6 +212,7 @@ def stop(name):
 @click.argument('name', required=False)
 def status(name):
     """Show status of processes."""
+    storage, manager = _lazy_core()
     if name:
         # Show detailed status for a specific process
         process = storage.get_process(name)
@@ -165,11 +272,17 @@ def status(name):
 @click.option('--follow', '-f', is_flag=True, help='Follow log output')
 def logs(name, stderr, lines, follow):
     """Show logs for a process."""
+    storage, manager = _lazy_core()
     stream = 'stderr' if stderr else 'stdout'
 
     if follow:
         click.echo(f"Following {stream} for '{name}' (Ctrl+C to stop)...")
-        last_size = 0
+        # Keep the log open between polls and read whatever was appended;
+        # reopen only when a newer execution takes over.
+        followed_path = None
+        log_file = None
+        decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        watcher = None
 
         try:
             while True:
@@ -186,19 +299,37 @@ def logs(name, stderr, lines, follow):
                 else:
                     log_path = storage.get_execution_log_path(name, execution.execution_id, stream)
 
-                if log_path.exists():
-                    current_size = log_path.stat().st_size
-                    if current_size > last_size:
-                        with open(log_path, 'r') as f:
-                            f.seek(last_size)
-                            new_content = f.read()
-                            click.echo(new_content, nl=False)
-                        last_size = current_size
+                if log_path != followed_path:
+                    if log_file:
+                        log_file.close()
+                        log_file = None
+                    followed_path = log_path
+                    decoder.reset()
 
-                time.sleep(0.5)
+                if log_file is None and log_path.exists():
+                    log_file = open(log_path, 'rb')
+
+                if log_file:
+                    new_content = decoder.decode(log_file.read())
+                    if new_content:
+                        click.echo(new_content, nl=False)
+
+                if watcher is None:
+                    watcher = _log_watcher(log_path.parent) or False
+
+                if watcher:
+                    # Block until the directory reports a write or a new execution
+                    watcher.read(timeout=1000)
+                else:
+                    time.sleep(0.5)
 
         except KeyboardInterrupt:
             click.echo("\nStopped following logs")
+        finally:
+            if log_file:
+                log_file.close()
+            if watcher:
+                watcher.close()
 
     else:
         # Just show the latest logs
@@ -213,6 +344,7 @@ def logs(name, stderr, lines, follow):
 @cli.command()
 def scheduler_start():
     """Start the background scheduler."""
+    scheduler = _lazy_scheduler()
     scheduler.start()
     click.echo("Scheduler started. Press Ctrl+C to stop...")
 
@@ -227,6 +359,7 @@ def scheduler_start():
 @cli.command()
 def scheduler_info():
     """Show scheduler information."""
+    scheduler = _lazy_scheduler()
     info = scheduler.get_schedule_info()
 
     click.echo(f"\nScheduler running: {info['running']}")
@@ -251,6 +384,7 @@ def scheduler_info():
 @click.option('--enable/--disable', default=True)
 def toggle(name, enable):
     """Enable or disable a process."""
+    storage = _lazy_storage()
     if storage.update_process(name, enabled=enable):
         status = "enabled" if enable else "disabled"
         click.echo(f"Process '{name}' {status}")
@@ -1,21 +1,38 @@
 """Core process management functionality."""
 
-import subprocess
 import threading
-import psutil
 import os
-import pwd
+import re
+import selectors
+import signal
+import sys
+import time
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import Dict, Optional, List
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Deque, Dict, FrozenSet, Optional, List, Tuple
 from pathlib import Path
-from .storage import Storage
+from .storage import Storage, execution_marked_running
+from .users import getpwuid
+
+if TYPE_CHECKING:
+    import subprocess
+
+
+# Number of executions per process kept in memory by ProcessManager
+EXECUTION_HISTORY = 256
+
+# Log tails kept by _cached_tail, and the largest tail worth keeping
+TAIL_CACHE_ENTRIES = 256
+TAIL_CACHE_MAX_CHARS = 1 << 20
 
 
 def demote(uid: int, gid: int):
     """Demote process privileges to specified uid/gid.
 
     This function is used as preexec_fn in subprocess.Popen to ensure
-    the child process runs with the correct user privileges.
+    the child process runs with the correct user privileges on Python
+    versions without Popen's user/group arguments (< 3.9).
 
     Args:
         uid: User ID to run as
@@ -27,40 +44,302 @@ def demote(uid: int, gid: int):
     return set_ids
 
 
+_execution_id_lock = threading.Lock()
+_last_execution_us = 0
+
+
+def _new_execution_id() -> str:
+    """Generate a unique execution ID of the form YYYYMMDD_HHMMSS_ffffff.
+
+    The format is the one the status code parses start times from, and IDs
+    sort lexicographically by start time. IDs are strictly increasing within
+    this interpreter, so two executions started in the same microsecond get
+    consecutive values instead of sharing log files.
+    """
+    global _last_execution_us
+    now_us = time.time_ns() // 1000
+    with _execution_id_lock:
+        if now_us <= _last_execution_us:
+            now_us = _last_execution_us + 1
+        _last_execution_us = now_us
+
+    t = datetime.fromtimestamp(now_us // 1_000_000)
+    return (f"{t.year:04d}{t.month:02d}{t.day:02d}_"
+            f"{t.hour:02d}{t.minute:02d}{t.second:02d}_{now_us % 1_000_000:06d}")
+
+
+def _terminate_tree(parent, timeout: float = 5) -> None:
+    """Terminate a psutil.Process and all of its descendants.
+
+    Sends SIGTERM, waits up to timeout seconds, then SIGKILLs whatever is
+    left. Executions are started as process group leaders, so the whole
+    tree is signalled with killpg(). Processes that don't lead their own
+    group (started by older versions) have their descendants collected
+    with a single children() walk, reused for both the terminate and kill
+    phases.
+    """
+    import psutil
+
+    try:
+        group_leader = os.getpgid(parent.pid) == parent.pid
+    except ProcessLookupError:
+        return
+
+    if group_leader:
+        try:
+            os.killpg(parent.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+        procs = [parent]
+    else:
+        try:
+            procs = parent.children(recursive=True) + [parent]
+        except psutil.NoSuchProcess:
+            return
+        for proc in procs:
+            try:
+                proc.terminate()
+            except psutil.NoSuchProcess:
+                pass
+
+    _, alive = psutil.wait_procs(procs, timeout=timeout)
+    if not alive:
+        return
+
+    if group_leader:
+        try:
+            os.killpg(parent.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    else:
+        for proc in alive:
+            try:
+                proc.kill()
+            except psutil.NoSuchProcess:
+                pass
+
+
+def _latest_execution_id_in(exec_dir) -> Optional[str]:
+    """Return the newest execution ID with a stdout log in exec_dir.
+
+    Execution IDs sort lexicographically by start time, so a single scandir
+    pass keeping the maximum is enough - no list building or sorting.
+    """
+    latest = None
+    try:
+        with os.scandir(exec_dir) as entries:
+            for entry in entries:
+                entry_name = entry.name
+                if entry_name.endswith(".stdout.log"):
+                    execution_id = entry_name[:-len(".stdout.log")]
+                    if latest is None or execution_id > latest:
+                        latest = execution_id
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return latest
+
+
+def _proc_start_ticks(pid: int) -> Optional[int]:
+    """Return a process's start time in clock ticks since boot (Linux).
+
+    Together with the PID this identifies a process even after the PID is
+    recycled. Returns None if /proc is unavailable or the process is gone.
+    """
+    try:
+        with open(f'/proc/{pid}/stat', 'rb') as f:
+            stat = f.read()
+        # comm (field 2) may contain spaces or parens; starttime, field 22,
+        # is the 20th field after its closing paren
+        return int(stat.rsplit(b')', 1)[1].split()[19])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _pid_alive(pid: int, start_ticks: Optional[int] = None) -> bool:
+    """Check whether a process with the given PID exists.
+
+    If start_ticks (recorded when the process was started) is given and
+    /proc is available, a different process that reused the PID doesn't
+    count.
+    """
+    if start_ticks is not None:
+        current = _proc_start_ticks(pid)
+        if current is not None:
+            return current == start_ticks
+    try:
+        os.kill(pid, 0)  # Doesn't kill, just checks if exists
+        return True
+    except OSError:
+        return False
+
+
+def execution_alive(meta: Dict, live: Optional[FrozenSet[int]] = None) -> bool:
+    """Whether the process recorded in execution metadata is still running.
+
+    Args:
+        meta: Execution metadata from Storage.read_execution_meta()
+        live: Optional live_pids() snapshot; when checking many executions
+            it rules out dead PIDs without a syscall each
+    """
+    if not execution_marked_running(meta):
+        return False
+    if live is not None and meta["pid"] not in live:
+        return False
+    return _pid_alive(meta["pid"], meta.get("proc_start"))
+
+
+def live_pids() -> FrozenSet[int]:
+    """Snapshot the set of live PIDs with a single directory listing.
+
+    Reads /proc on Linux; elsewhere falls back to psutil.pids(), which is
+    also a single enumeration.
+    """
+    try:
+        return frozenset(int(entry) for entry in os.listdir('/proc') if entry.isdigit())
+    except FileNotFoundError:
+        import psutil
+        return frozenset(psutil.pids())
+
+
+@lru_cache(maxsize=4096)
+def parse_execution_start(execution_id: str) -> Optional[str]:
+    """Parse the start time encoded in an execution ID as ISO format.
+
+    The ID layout is fixed (YYYYMMDD_HHMMSS[_ffffff]), so the fields are
+    sliced out directly instead of going through strptime(). An ID never
+    changes, so results are memoized for repeated polls.
+    """
+    # execution_id format: 20231121_143025_123456
+    if len(execution_id) < 15 or execution_id[8] != '_':
+        return None
+    try:
+        return datetime(
+            int(execution_id[0:4]), int(execution_id[4:6]), int(execution_id[6:8]),
+            int(execution_id[9:11]), int(execution_id[11:13]), int(execution_id[13:15])
+        ).isoformat()
+    except ValueError:
+        return None
+
+
+def _tail(path: Path, n: int, chunk_size: int = 65536) -> str:
+    """Return the last n lines of a file without reading all of it.
+
+    Reads backwards in fixed-size chunks until enough newlines have been
+    seen, so the cost depends on the size of the tail rather than the file.
+    A non-positive n returns the whole file.
+    """
+    with open(path, 'rb') as f:
+        if n <= 0:
+            return f.read().decode('utf-8', 'replace')
+
+        f.seek(0, os.SEEK_END)
+        remaining = f.tell()
+        chunks = deque()
+        newlines = 0
+        # n+1 newlines guarantees the first of the last n lines is complete
+        while remaining > 0 and newlines <= n:
+            size = min(chunk_size, remaining)
+            remaining -= size
+            f.seek(remaining)
+            chunk = f.read(size)
+            chunks.appendleft(chunk)
+            newlines += chunk.count(b'\n')
+
+    data = b''.join(chunks).decode('utf-8', 'replace')
+    # Split on '\n' only: str.splitlines() also breaks on form feeds,
+    # \x1c-\x1e, \x85 and U+2028/9, which would miscount the lines
+    lines = re.split(r'(?<=\n)', data)
+    if lines and not lines[-1]:
+        lines.pop()
+    return ''.join(lines[-n:])
+
+
+# (path, lines) -> (file signature, tail); most recently used last
+_tail_cache: "OrderedDict[Tuple[str, int], Tuple[Tuple[int, int, int], str]]" = OrderedDict()
+_tail_cache_lock = threading.Lock()
+
+
+def _cached_tail(path: Path, n: int) -> str:
+    """_tail() that skips re-reading files that haven't changed.
+
+    Results are cached against the file's mtime, size and inode, so
+    repeated polls of an idle log cost one stat.
+
+    Raises:
+        FileNotFoundError: If the log doesn't exist
+    """
+    st = os.stat(path)
+    signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+    key = (str(path), n)
+    with _tail_cache_lock:
+        cached = _tail_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            _tail_cache.move_to_end(key)
+            return cached[1]
+
+    content = _tail(path, n)
+    if len(content) <= TAIL_CACHE_MAX_CHARS:
+        with _tail_cache_lock:
+            _tail_cache[key] = (signature, content)
+            _tail_cache.move_to_end(key)
+            while len(_tail_cache) > TAIL_CACHE_ENTRIES:
+                _tail_cache.popitem(last=False)
+    return content
+
+
 class ProcessExecution:
     """Represents a single execution of a process."""
 
-    def __init__(self, name: str, script_path: str, storage: Storage, uid: Optional[int] = None, args: Optional[List[str]] = None):
+    def __init__(self, name: str, script_path: str, storage: Storage, uid: Optional[int] = None, args: Optional[List[str]] = None,
+                 on_exit: Optional[Callable[["ProcessExecution"], None]] = None):
         self.name = name
         self.script_path = script_path
         self.storage = storage
         self.uid = uid if uid is not None else os.getuid()
         self.args = args or []
-        self.execution_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        self.process: Optional[subprocess.Popen] = None
+        self.execution_id = _new_execution_id()
+        self.process: Optional["subprocess.Popen"] = None
         self.pid: Optional[int] = None
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
         self.exit_code: Optional[int] = None
         self.status = "pending"
+        self._start_ticks: Optional[int] = None
+        self.on_exit = on_exit
+        # Set once the exit has been recorded, by the reaper or _monitor
+        self._exited = threading.Event()
+        # Set by stop() so the recorded exit reads "stopped", not "failed"
+        self._stop_requested = False
 
     def start(self) -> bool:
         """Start the process execution."""
+        import subprocess
+
         try:
             stdout_log = self.storage.get_execution_log_path(self.name, self.execution_id, "stdout")
             stderr_log = self.storage.get_execution_log_path(self.name, self.execution_id, "stderr")
 
-            stdout_file = open(stdout_log, 'w')
-            stderr_file = open(stderr_log, 'w')
-
-            # Prepare preexec_fn for privilege demotion if running as root
-            preexec_fn = None
+            # Drop privileges to the target user if running as root. On
+            # Python 3.9+ Popen does this itself (user/group/extra_groups):
+            # no Python preexec_fn runs in the forked child, and the child
+            # gets the user's supplementary groups instead of keeping
+            # root's. (Setting these still rules out vfork/posix_spawn, so
+            # the spawn itself is no faster.) Older Pythons fall back to
+            # preexec_fn.
+            popen_kwargs = {}
             if os.getuid() == 0:  # Running as root
                 # Get the GID for the target user
                 try:
-                    user_info = pwd.getpwuid(self.uid)
+                    user_info = getpwuid(self.uid)
                     gid = user_info.pw_gid
-                    preexec_fn = demote(self.uid, gid)
+                    if sys.version_info >= (3, 9):
+                        popen_kwargs.update(
+                            user=self.uid,
+                            group=gid,
+                            extra_groups=os.getgrouplist(user_info.pw_name, gid)
+                        )
+                    else:
+                        popen_kwargs['preexec_fn'] = demote(self.uid, gid)
                     print(f"Running process {self.name} as uid={self.uid}, gid={gid}")
                 except KeyError:
                     print(f"Warning: Could not find user info for uid {self.uid}, running as current user")
@@ -68,34 +347,42 @@ class ProcessExecution:
             # Build command with optional arguments
             cmd = ['/bin/bash', self.script_path] + self.args
 
-            self.process = subprocess.Popen(
-                cmd,
-                stdout=stdout_file,
-                stderr=stderr_file,
-                cwd=os.path.dirname(self.script_path) or '.',
-                preexec_fn=preexec_fn
-            )
+            # Raw fds instead of file objects. The child gets its own copies
+            # as stdout/stderr, so the parent closes them right after the
+            # spawn; O_CLOEXEC keeps them out of other children meanwhile.
+            flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC
+            stdout_fd = os.open(stdout_log, flags, 0o644)
+            try:
+                stderr_fd = os.open(stderr_log, flags, 0o644)
+                try:
+                    self.process = subprocess.Popen(
+                        cmd,
+                        stdout=stdout_fd,
+                        stderr=stderr_fd,
+                        close_fds=True,
+                        cwd=os.path.dirname(self.script_path) or '.',
+                        start_new_session=True,  # Own process group, so stop() can killpg it
+                        **popen_kwargs
+                    )
+                finally:
+                    os.close(stderr_fd)
+            finally:
+                os.close(stdout_fd)
 
             self.pid = self.process.pid
             self.start_time = datetime.now()
             self.status = "running"
 
-            # Save PID to file for cross-request status tracking
-            pid_file = self.storage.logs_dir / self.name / f"{self.execution_id}.pid"
-            pid_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(pid_file, 'w') as f:
-                f.write(str(self.pid))
+            # Save PID, args and start time for cross-request status tracking
+            self._start_ticks = _proc_start_ticks(self.pid)
+            self.storage.write_execution_meta(self.name, self.execution_id, self._meta())
 
-            # Save args to file for cross-request status tracking
-            if self.args:
-                args_file = self.storage.logs_dir / self.name / f"{self.execution_id}.args"
-                with open(args_file, 'w') as f:
-                    f.write('\n'.join(self.args))
-
-            # Start a thread to monitor completion
+            # Hand the process to the shared reaper; fall back to a dedicated
+            # monitor thread where pidfds are unavailable (non-Linux, < 5.3).
             # Note: Using daemon=False so the thread can complete even if the request handler returns
-            t = threading.Thread(target=self._monitor, args=(stdout_file, stderr_file), daemon=False)
-            t.start()
+            if not _reaper.watch(self):
+                t = threading.Thread(target=self._monitor, daemon=False)
+                t.start()
 
             return True
         except Exception as e:
@@ -104,58 +391,79 @@ class ProcessExecution:
             print(f"Failed to start process {self.name}: {e}")
             return False
 
-    def _monitor(self, stdout_file, stderr_file):
-        """Monitor process completion."""
-        import time
-
+    def _monitor(self):
+        """Wait for process completion on a dedicated thread (no pidfd support)."""
         try:
-            # Use poll() in a loop instead of wait() to avoid hanging on unclosed pipes
-            # This is necessary because child processes may spawn grandchildren that keep
-            # stdout/stderr file descriptors open, causing wait() to hang indefinitely
-            while True:
-                self.exit_code = self.process.poll()
-                if self.exit_code is not None:
-                    break
-                time.sleep(0.1)  # Check every 100ms
+            # wait() blocks in waitpid(), which returns as soon as the child
+            # exits. Grandchildren holding the log fds open can't delay it;
+            # that only affects communicate() with pipes, not file redirects.
+            self.process.wait()
+        except Exception as e:
+            print(f"Error monitoring process {self.name}: {e}")
+        self._on_exit()
 
+    def _on_exit(self, wait_status=None):
+        """Record completion of the exited process and persist its exit code.
+
+        Args:
+            wait_status: Result of os.waitid() if the caller already reaped
+                the process; otherwise it is reaped through Popen
+        """
+        try:
+            if wait_status is not None:
+                if wait_status.si_code == os.CLD_EXITED:
+                    self.exit_code = wait_status.si_status
+                else:
+                    self.exit_code = -wait_status.si_status  # Killed by a signal
+                # Tell Popen the child is gone so it never waits for it again
+                self.process.returncode = self.exit_code
+            else:
+                # The process has already exited, so this returns without blocking
+                self.exit_code = self.process.wait()
             self.end_time = datetime.now()
-            self.status = "completed" if self.exit_code == 0 else "failed"
+            if self._stop_requested:
+                self.status = "stopped"
+            else:
+                self.status = "completed" if self.exit_code == 0 else "failed"
         except Exception as e:
             self.status = "failed"
             self.exit_code = -1
             print(f"Error monitoring process {self.name}: {e}")
         finally:
-            stdout_file.close()
-            stderr_file.close()
-
-            # Save exit code to file for persistence
-            exitcode_file = self.storage.logs_dir / self.name / f"{self.execution_id}.exitcode"
+            # Save exit code and end time; this also marks the execution as
+            # finished for other interpreters
+            if self.exit_code is None:
+                self.exit_code = -1
             try:
-                with open(exitcode_file, 'w') as f:
-                    f.write(str(self.exit_code if self.exit_code is not None else -1))
+                self.storage.write_execution_meta(self.name, self.execution_id, self._meta())
             except Exception as e:
                 print(f"Failed to save exit code: {e}")
 
-            # Remove PID file when process completes
-            pid_file = self.storage.logs_dir / self.name / f"{self.execution_id}.pid"
-            if pid_file.exists():
-                pid_file.unlink()
+            if self.on_exit:
+                self.on_exit(self)
+            self._exited.set()
 
     def stop(self) -> bool:
         """Stop the running process."""
         if self.process and self.status == "running":
+            # Flag the stop before signalling so _on_exit records the exit
+            # as "stopped" in memory and on disk alike
+            self._stop_requested = True
             try:
-                parent = psutil.Process(self.pid)
-                for child in parent.children(recursive=True):
-                    child.terminate()
-                parent.terminate()
-
-                # Wait a bit, then kill if still alive
-                parent.wait(timeout=5)
+                # The execution leads its own process group, so one killpg
+                # reaches the script and everything it spawned
+                os.killpg(self.process.pid, signal.SIGTERM)
+
+                # Wait a bit, then kill if still alive. Waiting on the exit
+                # event rather than Popen.wait() leaves reaping to the reaper.
+                if not self._exited.wait(timeout=5):
+                    os.killpg(self.process.pid, signal.SIGKILL)
+                    self._exited.wait(timeout=5)
                 self.status = "stopped"
-                self.end_time = datetime.now()
+                if self.end_time is None:
+                    self.end_time = datetime.now()
                 return True
-            except psutil.NoSuchProcess:
+            except ProcessLookupError:
                 self.status = "stopped"
                 return True
             except Exception as e:
@@ -163,6 +471,13 @@ class ProcessExecution:
                 return False
         return False
 
+    def _meta(self) -> Dict:
+        """Execution info as persisted to the execution's metadata file."""
+        meta = self.get_info()
+        # Lets other interpreters tell this process from one reusing its PID
+        meta["proc_start"] = self._start_ticks
+        return meta
+
     def get_info(self) -> Dict:
         """Get execution information."""
         return {
@@ -178,14 +493,96 @@ class ProcessExecution:
         }
 
 
+class _Reaper:
+    """Single background thread that waits for all running executions.
+
+    Each execution's pidfd is registered with one selector, and the thread
+    finalizes executions as their pidfds become readable (the process has
+    exited). This replaces one monitor thread per running execution. The
+    thread exits once nothing is being watched and is restarted on demand;
+    it is non-daemon so pending executions are finalized before the
+    interpreter exits.
+    """
+
+    def __init__(self):
+        self._selector = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, execution: ProcessExecution) -> bool:
+        """Watch an execution for exit. Returns False if pidfds are unsupported."""
+        # gevent/eventlet monkey patching removes epoll; their cooperative
+        # Popen.wait() in the fallback monitor is the right tool there
+        if not hasattr(os, "pidfd_open") or not hasattr(selectors, "EpollSelector"):
+            return False
+        try:
+            pidfd = os.pidfd_open(execution.pid)
+        except OSError:
+            return False
+
+        with self._lock:
+            if self._selector is None:
+                # pidfds only exist on Linux, so epoll is always available;
+                # it also sees fds registered while select() is blocked.
+                self._selector = selectors.EpollSelector()
+            self._selector.register(pidfd, selectors.EVENT_READ, execution)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="procorg-reaper", daemon=False)
+                self._thread.start()
+        return True
+
+    def _run(self):
+        """Reaper loop: finalize executions whose pidfd reports exit."""
+        while True:
+            with self._lock:
+                if not self._selector.get_map():
+                    self._thread = None
+                    return
+
+            # Block until a watched process exits; no periodic wakeups
+            for key, _ in self._selector.select():
+                with self._lock:
+                    self._selector.unregister(key.fd)
+                # Reap through the pidfd itself: one syscall that also yields
+                # the exit status (Python 3.9+); otherwise Popen reaps it
+                wait_status = None
+                if hasattr(os, "P_PIDFD"):
+                    try:
+                        wait_status = os.waitid(os.P_PIDFD, key.fd, os.WEXITED)
+                    except ChildProcessError:
+                        pass
+                os.close(key.fd)
+                key.data._on_exit(wait_status)
+
+
+_reaper = _Reaper()
+
+
 class ProcessManager:
     """Manages process executions."""
 
     def __init__(self, storage: Storage, uid: Optional[int] = None):
         self.storage = storage
         self.uid = uid if uid is not None else os.getuid()
-        self.executions: Dict[str, List[ProcessExecution]] = {}
-        self.lock = threading.Lock()
+        # Recent executions per process, newest last. Older history lives on disk.
+        self.executions: Dict[str, Deque[ProcessExecution]] = {}
+        # name -> {execution_id: execution} for executions that haven't exited
+        self._running: Dict[str, Dict[str, ProcessExecution]] = {}
+        # One lock per process name guards that name's entries in
+        # executions and _running, so work on one process never waits
+        # for another; _name_locks_guard only protects the lock table
+        self._name_locks: Dict[str, threading.Lock] = {}
+        self._name_locks_guard = threading.Lock()
+        # name -> (storage.execution_dir_signature, latest execution ID) for _get_latest_execution_id
+        self._latest_id_cache: Dict[str, Tuple[tuple, Optional[str]]] = {}
+
+    def _lock_for(self, name: str) -> threading.Lock:
+        """Return the lock guarding a process name's in-memory state."""
+        lock = self._name_locks.get(name)
+        if lock is None:
+            with self._name_locks_guard:
+                lock = self._name_locks.setdefault(name, threading.Lock())
+        return lock
 
     def run_process(self, name: str, args: Optional[List[str]] = None) -> Optional[ProcessExecution]:
         """Execute a registered process."""
@@ -205,26 +602,50 @@ class ProcessManager:
             print(f"Script not found: {script_path}")
             return None
 
-        execution = ProcessExecution(name, script_path, self.storage, uid=self.uid, args=args)
+        execution = ProcessExecution(name, script_path, self.storage, uid=self.uid, args=args,
+                                     on_exit=self._execution_finished)
 
-        with self.lock:
+        lock = self._lock_for(name)
+        with lock:
             if name not in self.executions:
-                self.executions[name] = []
+                self.executions[name] = deque(maxlen=EXECUTION_HISTORY)
             self.executions[name].append(execution)
+        self._latest_id_cache.pop(name, None)
 
         if execution.start():
+            with lock:
+                # A very short process may already have exited and run its
+                # on_exit callback; only index it if it is still running
+                if execution.status == "running":
+                    self._running.setdefault(name, {})[execution.execution_id] = execution
             return execution
         return None
 
+    def _execution_finished(self, execution: ProcessExecution) -> None:
+        """Drop an exited execution from the running index."""
+        with self._lock_for(execution.name):
+            running = self._running.get(execution.name)
+            if running is not None:
+                running.pop(execution.execution_id, None)
+                if not running:
+                    del self._running[execution.name]
+
     def get_running_execution(self, name: str) -> Optional[ProcessExecution]:
         """Get the currently running execution for a process."""
-        with self.lock:
-            if name in self.executions:
-                for execution in reversed(self.executions[name]):
-                    if execution.status == "running":
-                        return execution
+        with self._lock_for(name):
+            for execution in reversed(list(self._running.get(name, {}).values())):
+                if execution.status == "running":
+                    return execution
         return None
 
+    def get_running_executions(self, name: str) -> List[Dict]:
+        """Get info for every in-memory execution of a process that is running."""
+        with self._lock_for(name):
+            running = [execution for execution in self._running.get(name, {}).values()
+                       if execution.status == "running"]
+        # get_info() only reads attributes, so build the dicts without the lock
+        return [execution.get_info() for execution in running]
+
     def stop_process(self, name: str) -> bool:
         """Stop a running process."""
         # First try in-memory executions
@@ -232,154 +653,156 @@ class ProcessManager:
         if execution:
             return execution.stop()
 
-        # If not in memory, check filesystem for PID file
+        # If not in memory, check the execution metadata on disk
         execution_id = self._get_latest_execution_id(name)
+        if not execution_id:
+            return False
 
-        if execution_id:
-            pid_file = self.storage.logs_dir / name / f"{execution_id}.pid"
+        meta = self.storage.read_execution_meta(name, execution_id)
+        if not execution_marked_running(meta):
+            return False
 
-            if pid_file.exists():
+        try:
+            # Use psutil to stop the process and its children, unless the
+            # PID now belongs to an unrelated process
+            import psutil
+            if execution_alive(meta):
                 try:
-                    with open(pid_file, 'r') as f:
-                        pid = int(f.read().strip())
-
-                    # Use psutil to stop the process and its children
-                    try:
-                        parent = psutil.Process(pid)
-
-                        children = parent.children(recursive=True)
-
-                        for child in children:
-                            child.terminate()
-                        parent.terminate()
-
-                        # Wait a bit, then kill if still alive
-                        parent.wait(timeout=5)
-
-                        # Clean up PID file (may fail if owned by different user)
-                        try:
-                            pid_file.unlink()
-                        except PermissionError:
-                            pass  # Process was stopped, PID file cleanup is not critical
-
-                        # Write exit code indicating manual stop
-                        try:
-                            exitcode_file = self.storage.logs_dir / name / f"{execution_id}.exitcode"
-                            with open(exitcode_file, 'w') as f:
-                                f.write("-15")  # SIGTERM
-                        except PermissionError:
-                            pass  # Exit code writing is not critical
-
-                        return True
-                    except psutil.NoSuchProcess:
-                        # Process already stopped, clean up PID file
-                        try:
-                            pid_file.unlink()
-                        except PermissionError:
-                            pass
-                        return True
-                    except psutil.TimeoutExpired:
-                        # Force kill if didn't stop gracefully
-                        for child in parent.children(recursive=True):
-                            child.kill()
-                        parent.kill()
-                        try:
-                            pid_file.unlink()
-                        except PermissionError:
-                            pass
-                        return True
-                except (ValueError, FileNotFoundError) as e:
-                    print(f"Error reading PID file: {e}")
-                    return False
-                except Exception as e:
-                    print(f"Error stopping process {name}: {e}")
-                    return False
+                    _terminate_tree(psutil.Process(meta["pid"]))
+                except psutil.NoSuchProcess:
+                    pass  # Already gone; still mark it finished below
+
+            # Record the manual stop. The interpreter that started it, if
+            # still alive, overwrites this with the real exit status.
+            meta.update(
+                status="stopped",
+                exit_code=-15,  # SIGTERM
+                end_time=datetime.now().isoformat()
+            )
+            try:
+                self.storage.write_execution_meta(name, execution_id, meta)
+            except PermissionError:
+                pass  # Process was stopped, metadata update is not critical
 
-        return False
+            return True
+        except Exception as e:
+            print(f"Error stopping process {name}: {e}")
+            return False
 
     def get_process_status(self, name: str) -> Dict:
         """Get the status of a process."""
-        with self.lock:
+        # Snapshot in-memory state under the lock; filesystem and liveness
+        # checks happen after it is released so they don't block run_process.
+        with self._lock_for(name):
             executions = self.executions.get(name, [])
+            total_executions = len(executions)
+            latest_execution_info = executions[-1].get_info() if executions else None
+            is_running = name in self._running
+
+        if latest_execution_info is None:
+            # Scan filesystem for latest execution
+            execution_id = self._get_latest_execution_id(name)
+            if execution_id:
+                # Check if this execution is still running by checking PID
+                meta = self.storage.read_execution_meta(name, execution_id)
+                is_running = execution_alive(meta)
+                latest_execution_info = self._filesystem_execution_info(name, execution_id, is_running, meta)
 
-            # Check in-memory executions first
-            latest_in_memory = executions[-1] if executions else None
-            is_running_in_memory = any(e.status == "running" for e in executions)
-
-            # If no in-memory executions, check filesystem for latest
-            latest_execution_info = None
-            is_running = is_running_in_memory
+        return {
+            "name": name,
+            "latest_execution": latest_execution_info,
+            "total_executions": total_executions,
+            "running": is_running
+        }
 
-            if latest_in_memory:
-                latest_execution_info = latest_in_memory.get_info()
+    def get_all_statuses(self, processes: Optional[List[Dict]] = None) -> List[Dict]:
+        """Get status of all processes.
+
+        Args:
+            processes: Process definitions the caller already loaded from
+                this manager's storage; read from the registry if omitted
+        """
+        if processes is None:
+            processes = self.storage.list_processes()
+        return self._bulk_status_snapshot([p["name"] for p in processes])
+
+    def _bulk_status_snapshot(self, names: List[str]) -> List[Dict]:
+        """Build statuses for many processes with one directory walk."""
+        in_memory = {}
+        for name in names:
+            with self._lock_for(name):
+                executions = self.executions.get(name)
+                if executions:
+                    in_memory[name] = (
+                        executions[-1].get_info(),
+                        len(executions),
+                        name in self._running
+                    )
+
+        # Single pass over the logs directory for processes with no in-memory history
+        pending = {name for name in names if name not in in_memory}
+        latest_ids: Dict[str, str] = {}
+        if pending:
+            try:
+                with os.scandir(self.storage.logs_dir) as entries:
+                    for entry in entries:
+                        if entry.name in pending and entry.is_dir():
+                            execution_id = self._get_latest_execution_id(entry.name)
+                            if execution_id:
+                                latest_ids[entry.name] = execution_id
+            except FileNotFoundError:
+                pass
+
+        # Read all metadata, then check PIDs against one snapshot of live PIDs
+        metas = {name: self.storage.read_execution_meta(name, execution_id)
+                 for name, execution_id in latest_ids.items()}
+        pids = {name: meta["pid"] for name, meta in metas.items() if execution_marked_running(meta)}
+        live = live_pids() if pids else frozenset()
+        alive = {name for name, pid in pids.items()
+                 if pid in live and _pid_alive(pid, metas[name].get("proc_start"))}
+
+        statuses = []
+        for name in names:
+            if name in in_memory:
+                latest_execution_info, total, is_running = in_memory[name]
             else:
-                # Scan filesystem for latest execution
-                execution_id = self._get_latest_execution_id(name)
-                if execution_id:
-                    # Check if this execution is still running by checking PID
-                    pid_file = self.storage.logs_dir / name / f"{execution_id}.pid"
-                    if pid_file.exists():
-                        try:
-                            with open(pid_file, 'r') as f:
-                                pid = int(f.read().strip())
-                            # Check if process is still running
-                            try:
-                                os.kill(pid, 0)  # Doesn't kill, just checks if exists
-                                is_running = True
-                                status = "running"
-                            except OSError:
-                                is_running = False
-                                status = "completed"  # Or could check exit code
-                        except (ValueError, FileNotFoundError):
-                            is_running = False
-                            status = "completed"
-                    else:
-                        is_running = False
-                        status = "completed"
-
-                    # Parse start time from execution_id (format: YYYYMMDD_HHMMSS_microseconds)
-                    try:
-                        # execution_id format: 20231121_143025_123456
-                        date_part = execution_id.split('_')[0]  # YYYYMMDD
-                        time_part = execution_id.split('_')[1]  # HHMMSS
-                        start_time_str = f"{date_part[:4]}-{date_part[4:6]}-{date_part[6:8]} {time_part[:2]}:{time_part[2:4]}:{time_part[4:6]}"
-                        start_time = datetime.strptime(start_time_str, "%Y-%m-%d %H:%M:%S").isoformat()
-                    except (IndexError, ValueError):
-                        start_time = None
-
-                    # Read exit code from file if available
-                    exit_code = None
-                    exitcode_file = self.storage.logs_dir / name / f"{execution_id}.exitcode"
-                    if exitcode_file.exists():
-                        try:
-                            with open(exitcode_file, 'r') as f:
-                                exit_code = int(f.read().strip())
-                        except (ValueError, FileNotFoundError):
-                            pass
-
-                    # Build execution info from filesystem
-                    latest_execution_info = {
-                        "execution_id": execution_id,
-                        "name": name,
-                        "pid": None,
-                        "status": status if is_running else "completed",
-                        "start_time": start_time,
-                        "end_time": None,
-                        "exit_code": exit_code,
-                        "duration": None
-                    }
-
-            return {
+                execution_id = latest_ids.get(name)
+                total = 0
+                is_running = name in alive
+                latest_execution_info = (
+                    self._filesystem_execution_info(name, execution_id, is_running, metas[name])
+                    if execution_id else None
+                )
+            statuses.append({
                 "name": name,
                 "latest_execution": latest_execution_info,
-                "total_executions": len(executions),
+                "total_executions": total,
                 "running": is_running
-            }
-
-    def get_all_statuses(self) -> List[Dict]:
-        """Get status of all processes."""
-        processes = self.storage.list_processes()
-        return [self.get_process_status(p["name"]) for p in processes]
+            })
+        return statuses
+
+    def _filesystem_execution_info(self, name: str, execution_id: str, is_running: bool,
+                                   meta: Dict) -> Dict:
+        """Build execution info for an execution known only from its files on disk."""
+        if is_running:
+            status = "running"
+        elif meta.get("status") in (None, "running"):
+            # Legacy sidecars carry no status, and an interpreter that died
+            # before reaping its child leaves "running" behind
+            status = "completed"
+        else:
+            status = meta["status"]
+        return {
+            "execution_id": execution_id,
+            "name": name,
+            "pid": meta.get("pid"),
+            "status": status,
+            "args": meta.get("args", []),
+            "start_time": meta.get("start_time") or parse_execution_start(execution_id),
+            "end_time": meta.get("end_time"),
+            "exit_code": meta.get("exit_code"),
+            "duration": meta.get("duration")
+        }
 
     def get_execution_logs(self, name: str, execution_id: str, stream: str = "stdout") -> str:
         """Read logs for a specific execution."""
@@ -392,42 +815,47 @@ class ProcessManager:
 
     def get_latest_logs(self, name: str, stream: str = "stdout", lines: int = 100) -> str:
         """Get the latest logs for a process."""
-        # First check in-memory executions
-        with self.lock:
-            executions = self.executions.get(name, [])
-            if executions:
-                latest = executions[-1]
-                log_path = self.storage.get_execution_log_path(name, latest.execution_id, stream)
-
-                if log_path.exists():
-                    with open(log_path, 'r') as f:
-                        all_lines = f.readlines()
-                        return ''.join(all_lines[-lines:])
+        # First check in-memory executions; only the lookup needs the lock,
+        # reading the log happens after it is released
+        with self._lock_for(name):
+            executions = self.executions.get(name)
+            latest_id = executions[-1].execution_id if executions else None
+
+        if latest_id:
+            log_path = self.storage.get_execution_log_path(name, latest_id, stream)
+            try:
+                return _cached_tail(log_path, lines)
+            except FileNotFoundError:
+                pass
 
         # If not in memory, scan filesystem for latest execution
         execution_id = self._get_latest_execution_id(name)
         if execution_id:
             log_path = self.storage.get_execution_log_path(name, execution_id, stream)
-            if log_path.exists():
-                with open(log_path, 'r') as f:
-                    all_lines = f.readlines()
-                    return ''.join(all_lines[-lines:])
+            try:
+                return _cached_tail(log_path, lines)
+            except FileNotFoundError:
+                pass
 
         return ""
 
     def _get_latest_execution_id(self, name: str) -> Optional[str]:
-        """Find the latest execution ID by scanning the logs directory."""
-        exec_dir = self.storage.logs_dir / name
-        if not exec_dir.exists():
-            return None
+        """Find the latest execution ID by scanning the logs directory.
 
-        # Find all stdout log files
-        log_files = list(exec_dir.glob("*.stdout.log"))
-        if not log_files:
+        The result is cached against storage.execution_dir_signature(), so
+        repeated lookups (e.g. ``logs --follow`` polling) cost a single stat
+        until a file is added or removed.
+        """
+        try:
+            signature = self.storage.execution_dir_signature(name)
+        except FileNotFoundError:
+            self._latest_id_cache.pop(name, None)
             return None
 
-        # Extract execution IDs and sort
-        execution_ids = [f.stem.replace('.stdout', '') for f in log_files]
-        execution_ids.sort(reverse=True)
+        cached = self._latest_id_cache.get(name)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
 
-        return execution_ids[0] if execution_ids else None
+        execution_id = _latest_execution_id_in(self.storage.logs_dir / name)
+        self._latest_id_cache[name] = (signature, execution_id)
+        return execution_id
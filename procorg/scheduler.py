@@ -1,13 +1,21 @@
 """Cron-based process scheduling."""
 
+import heapq
 import threading
 import time
 from datetime import datetime
 from croniter import croniter
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from .storage import Storage
 from .manager import ProcessManager
 
+# Upper bound on how long the scheduler sleeps before checking whether the
+# registry file was changed by another process (CLI, web UI)
+REGISTRY_CHECK_INTERVAL = 5.0
+
+# Delay before retrying a due process that is still running
+BUSY_RETRY_INTERVAL = 1.0
+
 
 class Scheduler:
     """Manages scheduled process executions based on cron expressions."""
@@ -19,6 +27,14 @@ class Scheduler:
         self.thread: Optional[threading.Thread] = None
         self.next_runs: Dict[str, datetime] = {}
         self.lock = threading.Lock()
+        # Parsed cron iterator per process, with the expression it was built
+        # from, so expressions are only parsed again when they change
+        self._crons: Dict[str, Tuple[str, croniter]] = {}
+        # Min-heap of (timestamp, name); entries whose timestamp no longer
+        # matches next_runs[name] are stale and skipped when popped
+        self._heap: List[Tuple[float, str]] = []
+        self._registry_signature = None
+        self._wake_event = threading.Event()
 
     def start(self):
         """Start the scheduler."""
@@ -26,6 +42,7 @@ class Scheduler:
             return
 
         self.running = True
+        self._wake_event.clear()
         self.thread = threading.Thread(target=self._run, daemon=True)
         self.thread.start()
         print("Scheduler started")
@@ -33,53 +50,139 @@ class Scheduler:
     def stop(self):
         """Stop the scheduler."""
         self.running = False
+        self._wake_event.set()
         if self.thread:
             self.thread.join(timeout=5)
         print("Scheduler stopped")
 
+    def wake(self):
+        """Re-read the registry and recompute the schedule right away.
+
+        Call this after registering, updating or removing processes so the
+        change takes effect without waiting for the next registry check.
+        """
+        self._registry_signature = None
+        self._wake_event.set()
+
     def _run(self):
-        """Main scheduler loop."""
+        """Main scheduler loop.
+
+        Sleeps until the earliest scheduled run, waking up at least every
+        REGISTRY_CHECK_INTERVAL seconds to pick up registry changes.
+        """
         while self.running:
             try:
                 self._check_and_run()
-                time.sleep(1)  # Check every second
+                delay = REGISTRY_CHECK_INTERVAL
+                with self.lock:
+                    if self._heap:
+                        delay = min(delay, max(0.0, self._heap[0][0] - time.time()))
+                self._wake_event.wait(timeout=delay)
+                self._wake_event.clear()
             except Exception as e:
                 print(f"Scheduler error: {e}")
+                time.sleep(1)
 
-    def _check_and_run(self):
-        """Check if any processes should run and execute them."""
-        processes = self.storage.list_processes()
+    def _refresh_schedule(self):
+        """Sync the schedule with the registry if the registry changed."""
+        signature = self.storage.registry_signature()
+        if signature == self._registry_signature:
+            return
+        self._registry_signature = signature
 
-        for process in processes:
-            name = process["name"]
-            cron_expr = process.get("cron_expr")
+        scheduled = {
+            process["name"]: process["cron_expr"]
+            for process in self.storage.list_processes()
+            if process.get("cron_expr") and process.get("enabled", True)
+        }
 
-            if not cron_expr or not process.get("enabled", True):
-                continue
+        now = datetime.now()
+        with self.lock:
+            for name in list(self.next_runs):
+                if name not in scheduled:
+                    del self.next_runs[name]
+                    del self._crons[name]
+
+            for name, cron_expr in scheduled.items():
+                if self._cron_expr(name) == cron_expr:
+                    continue
+                try:
+                    cron = croniter(cron_expr, now)
+                except Exception as e:
+                    print(f"Error scheduling {name}: {e}")
+                    continue
+                self._crons[name] = (cron_expr, cron)
+                self._schedule(name, cron.get_next(datetime))
+
+            # Drop stale entries so the heap doesn't grow with churn
+            self._heap = [entry for entry in self._heap
+                          if entry[1] in self.next_runs
+                          and entry[0] == self.next_runs[entry[1]].timestamp()]
+            heapq.heapify(self._heap)
+
+    def _cron_expr(self, name: str) -> Optional[str]:
+        """Return the cron expression a process is scheduled with, if any."""
+        cached = self._crons.get(name)
+        return cached[0] if cached else None
+
+    def _schedule(self, name: str, next_run: datetime):
+        """Record the next run of a process. Caller must hold self.lock."""
+        self.next_runs[name] = next_run
+        heapq.heappush(self._heap, (next_run.timestamp(), name))
+
+    def _pop_due(self) -> List[str]:
+        """Remove and return the names of all processes that are due."""
+        due = []
+        now = time.time()
+        with self.lock:
+            while self._heap and self._heap[0][0] <= now:
+                timestamp, name = heapq.heappop(self._heap)
+                next_run = self.next_runs.get(name)
+                if next_run is not None and next_run.timestamp() == timestamp:
+                    due.append(name)
+        return due
+
+    def _check_and_run(self):
+        """Run every process whose scheduled time has come."""
+        self._refresh_schedule()
 
-            # Check if this process is already running
-            if self.manager.get_running_execution(name):
+        for name in self._pop_due():
+            with self.lock:
+                cron_expr = self._cron_expr(name)
+            if cron_expr is None:
                 continue
 
             try:
-                now = datetime.now()
-
-                # Initialize next run time if not set
-                if name not in self.next_runs:
-                    cron = croniter(cron_expr, now)
-                    self.next_runs[name] = cron.get_next(datetime)
+                # Still running from last time: retry shortly so it runs
+                # as soon as the current execution ends
+                if self.manager.get_running_execution(name):
+                    with self.lock:
+                        if self._cron_expr(name) == cron_expr:
+                            retry_at = datetime.fromtimestamp(time.time() + BUSY_RETRY_INTERVAL)
+                            self._schedule(name, retry_at)
+                    continue
 
-                # Check if it's time to run
-                if now >= self.next_runs[name]:
-                    print(f"Scheduled execution of {name} at {now}")
-                    self.manager.run_process(name)
-
-                    # Calculate next run time
-                    cron = croniter(cron_expr, now)
-                    self.next_runs[name] = cron.get_next(datetime)
+                now = datetime.now()
+                print(f"Scheduled execution of {name} at {now}")
+                self.manager.run_process(name)
+
+                # Calculate next run time from now, so runs missed while
+                # this one was delayed are skipped rather than replayed
+                with self.lock:
+                    cached = self._crons.get(name)
+                    if cached and cached[0] == cron_expr:
+                        cron = cached[1]
+                        cron.set_current(now)
+                        self._schedule(name, cron.get_next(datetime))
 
             except Exception as e:
                 print(f"Error scheduling {name}: {e}")
+                # The due entry was already popped; retry shortly rather
+                # than leave the process unscheduled until the registry changes
+                with self.lock:
+                    if self._cron_expr(name) == cron_expr:
+                        retry_at = datetime.fromtimestamp(time.time() + BUSY_RETRY_INTERVAL)
+                        self._schedule(name, retry_at)
 
     def get_next_run(self, name: str) -> Optional[datetime]:
         """Get the next scheduled run time for a process."""
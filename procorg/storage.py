@@ -2,10 +2,100 @@
 
 import json
 import os
+import tempfile
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-import pwd
+from .users import getpwuid
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json works the same, just slower
+    orjson = None
+
+
+def dump_json(obj) -> bytes:
+    """Serialize to indented JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+
+def load_json(data: bytes):
+    """Parse JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Process umask, read once at import: os.umask() can only be queried by
+# setting it, which would race with files created by other threads later
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _atomic_write(path: Path, data: bytes) -> os.stat_result:
+    """Write data to path atomically and return the stat of the new file.
+
+    The data goes to a temporary file next to path which is then renamed
+    over it, so readers never see a partially written file. Every call
+    gets its own temporary file, so concurrent writers from any thread or
+    process never share one.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        # mkstemp creates the file 0600; give it the mode open() would have
+        os.fchmod(fd, 0o666 & ~_UMASK)
+        with open(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            st = os.fstat(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return st
+
+
+def _read_int(path: Path) -> Optional[int]:
+    """Read a small file holding one integer, such as a legacy .pid file.
+
+    Uses a single os.read() rather than a buffered text file object.
+
+    Returns:
+        The integer, or None if the file is missing, empty or malformed
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+    except FileNotFoundError:
+        return None
+    try:
+        data = os.read(fd, 32)
+    finally:
+        os.close(fd)
+    try:
+        return int(data)
+    except ValueError:
+        return None
+
+
+def execution_marked_running(meta: Dict) -> bool:
+    """Whether execution metadata says the process has not finished yet.
+
+    The caller still has to check that the recorded PID is alive; an
+    interpreter that died without reaping its child leaves this set.
+    """
+    return meta.get("pid") is not None and meta.get("exit_code") is None
+
+
+# Files that may belong to one execution. .pid, .exitcode and .args are the
+# sidecars written by older versions before .meta.json replaced them.
+EXECUTION_FILE_SUFFIXES = ('.stdout.log', '.stderr.log', '.meta.json', '.pid', '.exitcode', '.args')
 
 
 class Storage:
@@ -31,52 +121,143 @@ class Storage:
 
         self.logs_dir = self.data_dir / "logs"
         self.logs_dir.mkdir(parents=True, exist_ok=True)
-        self.registry_file = self.data_dir / "processes.json"
+        self.registry_file = self._registry_path(self.base_data_dir, uid)
+
+        # Parsed registry and the file signature it was read at
+        self._registry_cache: Optional[Dict] = None
+        self._registry_signature = None
+        # Serializes registry reads and load-modify-save cycles between the
+        # threads sharing this Storage (the web server keeps one per uid)
+        self._registry_lock = threading.RLock()
+        # name -> (running dir signature, [(execution_id, meta)]) for list_marked_running
+        self._marked_running_cache: Dict[str, Tuple[tuple, List[Tuple[str, Dict]]]] = {}
+        # name -> number of execution files written or deleted through this
+        # Storage; part of execution_dir_signature so these changes are seen
+        # even within one tick of a coarse directory mtime
+        self._execution_writes: Dict[str, int] = {}
+        self._execution_writes_lock = threading.Lock()
 
         if not self.registry_file.exists():
             self._save_registry({})
 
+    @staticmethod
+    def _registry_path(base_data_dir: Path, uid: int) -> Path:
+        """Get the registry file path of a user."""
+        return base_data_dir / "users" / str(uid) / "processes.json"
+
+    @staticmethod
+    def _file_signature(st: os.stat_result):
+        """Identify file or directory contents from a stat result."""
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def execution_dir_signature(self, name: str) -> tuple:
+        """Return a token that changes whenever a process's log directory changes.
+
+        Combines the directory's mtime, size and inode with a count of the
+        execution files written or deleted through this Storage, so caches
+        keyed on it also notice changes made within one mtime tick.
+
+        Raises:
+            FileNotFoundError: If the process has no log directory
+        """
+        st = os.stat(self.logs_dir / name)
+        return self._file_signature(st) + (self._execution_writes.get(name, 0),)
+
+    def _note_execution_write(self, name: str) -> None:
+        """Record that an execution file of a process was written or deleted."""
+        with self._execution_writes_lock:
+            self._execution_writes[name] = self._execution_writes.get(name, 0) + 1
+
+    def registry_signature(self):
+        """Return a token that changes whenever the registry file changes."""
+        return self._file_signature(os.stat(self.registry_file))
+
     def _save_registry(self, registry: Dict) -> None:
-        """Save the process registry to disk."""
-        with open(self.registry_file, 'w') as f:
-            json.dump(registry, f, indent=2)
+        """Save the process registry to disk atomically."""
+        with self._registry_lock:
+            signature = self._file_signature(_atomic_write(self.registry_file, dump_json(registry)))
+            self._registry_cache = {name: dict(proc) for name, proc in registry.items()}
+            self._registry_signature = signature
+
+    def _cached_registry(self) -> Dict:
+        """Return the parsed registry, re-reading it only if the file changed.
+
+        The parsed registry is cached and only re-read when the file's
+        mtime, size or inode change. The result is shared and must not be
+        modified; use _load_registry() for a copy.
+        """
+        with self._registry_lock:
+            signature = self._file_signature(os.stat(self.registry_file))
+            if self._registry_cache is None or signature != self._registry_signature:
+                with open(self.registry_file, 'rb') as f:
+                    self._registry_cache = load_json(f.read())
+                self._registry_signature = signature
+            return self._registry_cache
 
     def _load_registry(self) -> Dict:
-        """Load the process registry from disk."""
-        with open(self.registry_file, 'r') as f:
-            return json.load(f)
+        """Load the process registry from disk.
+
+        Callers get their own copy of every entry, so they may modify the
+        result freely.
+        """
+        return {name: dict(proc) for name, proc in self._cached_registry().items()}
 
     def register_process(self, name: str, script_path: str, cron_expr: Optional[str] = None,
                         description: str = "") -> None:
         """Register a new process."""
-        registry = self._load_registry()
-
-        registry[name] = {
+        self.register_processes([{
             "name": name,
             "script_path": script_path,
             "cron_expr": cron_expr,
-            "description": description,
-            "created_at": datetime.now().isoformat(),
-            "enabled": True,
-            "owner_uid": self.uid  # Track process owner
-        }
+            "description": description
+        }])
 
-        self._save_registry(registry)
+    def register_processes(self, entries: List[Dict]) -> int:
+        """Register several processes with a single registry write.
+
+        Args:
+            entries: Dicts with 'name' and 'script_path' keys and optional
+                'cron_expr' and 'description' keys
+
+        Returns:
+            Number of processes registered
+        """
+        created_at = datetime.now().isoformat()
+
+        with self._registry_lock:
+            registry = self._load_registry()
+            for entry in entries:
+                name = entry["name"]
+                registry[name] = {
+                    "name": name,
+                    "script_path": entry["script_path"],
+                    "cron_expr": entry.get("cron_expr"),
+                    "description": entry.get("description", ""),
+                    "created_at": created_at,
+                    "enabled": True,
+                    "owner_uid": self.uid  # Track process owner
+                }
+            self._save_registry(registry)
+        return len(entries)
 
     def unregister_process(self, name: str) -> bool:
         """Remove a process from the registry."""
-        registry = self._load_registry()
+        with self._registry_lock:
+            registry = self._load_registry()
 
-        if name in registry:
-            del registry[name]
-            self._save_registry(registry)
-            return True
-        return False
+            if name in registry:
+                del registry[name]
+                self._save_registry(registry)
+                return True
+            return False
 
     def get_process(self, name: str) -> Optional[Dict]:
-        """Get a specific process definition."""
-        registry = self._load_registry()
-        return registry.get(name)
+        """Get a specific process definition.
+
+        Only the requested entry is copied, not the whole registry.
+        """
+        proc = self._cached_registry().get(name)
+        return dict(proc) if proc is not None else None
 
     def list_processes(self) -> List[Dict]:
         """List all registered processes."""
@@ -85,17 +266,18 @@ class Storage:
 
     def update_process(self, name: str, **kwargs) -> bool:
         """Update process attributes."""
-        registry = self._load_registry()
+        with self._registry_lock:
+            registry = self._load_registry()
 
-        if name not in registry:
-            return False
+            if name not in registry:
+                return False
 
-        for key, value in kwargs.items():
-            if key in registry[name]:
-                registry[name][key] = value
+            for key, value in kwargs.items():
+                if key in registry[name]:
+                    registry[name][key] = value
 
-        self._save_registry(registry)
-        return True
+            self._save_registry(registry)
+            return True
 
     def get_log_path(self, name: str, stream: str = "stdout") -> Path:
         """Get the log file path for a process."""
@@ -107,6 +289,134 @@ class Storage:
         exec_dir.mkdir(parents=True, exist_ok=True)
         return exec_dir / f"{execution_id}.{stream}.log"
 
+    def list_execution_ids(self, name: str) -> List[str]:
+        """List execution IDs that have a stdout log for a process.
+
+        Uses a single scandir pass with a suffix check rather than a glob.
+        """
+        suffix = ".stdout.log"
+        try:
+            with os.scandir(self.logs_dir / name) as entries:
+                return [entry.name[:-len(suffix)] for entry in entries if entry.name.endswith(suffix)]
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+
+    def get_execution_meta_path(self, name: str, execution_id: str) -> Path:
+        """Get the metadata file path for a specific execution."""
+        return self.logs_dir / name / f"{execution_id}.meta.json"
+
+    def _running_dir(self, name: str) -> Path:
+        """Directory of empty marker files, one per running execution of a process."""
+        return self.logs_dir / name / "running"
+
+    def write_execution_meta(self, name: str, execution_id: str, meta: Dict) -> None:
+        """Persist the metadata (PID, args, times, exit code) of an execution.
+
+        Also keeps the execution's running marker in step with the metadata:
+        it exists while the metadata says the execution has not finished.
+        """
+        _atomic_write(self.get_execution_meta_path(name, execution_id), dump_json(meta))
+        marker = self._running_dir(name) / execution_id
+        if execution_marked_running(meta):
+            marker.parent.mkdir(exist_ok=True)
+            marker.touch()
+        else:
+            try:
+                marker.unlink()
+            except FileNotFoundError:
+                pass
+        self._note_execution_write(name)
+
+    def read_execution_meta(self, name: str, execution_id: str) -> Dict:
+        """Read the metadata of an execution.
+
+        Executions started by older versions have no .meta.json; their
+        .pid, .args and .exitcode sidecar files are read instead.
+
+        Returns:
+            Metadata dict with at least 'pid', 'args' and 'exit_code' keys;
+            'exit_code' is None until the execution has finished
+        """
+        try:
+            with open(self.get_execution_meta_path(name, execution_id), 'rb') as f:
+                meta = load_json(f.read())
+            meta.setdefault("args", [])
+            meta.setdefault("exit_code", None)
+            meta.setdefault("pid", None)
+            return meta
+        except (FileNotFoundError, ValueError):
+            pass
+
+        exec_dir = self.logs_dir / name
+        meta = {
+            "pid": _read_int(exec_dir / f"{execution_id}.pid"),
+            "args": [],
+            "exit_code": _read_int(exec_dir / f"{execution_id}.exitcode"),
+        }
+        try:
+            with open(exec_dir / f"{execution_id}.args", 'r') as f:
+                meta["args"] = [line.strip() for line in f if line.strip()]
+        except FileNotFoundError:
+            pass
+        return meta
+
+    def list_marked_running(self, name: str) -> List[Tuple[str, Dict]]:
+        """List executions of a process whose metadata says they are running.
+
+        Only executions with a running marker (see write_execution_meta)
+        are read, so the cost follows the number of running executions
+        rather than the size of the history. Markers are created and removed
+        as executions start and finish, so the result is cached against the
+        marker directory's signature and only rebuilt when it changes.
+        Callers still have to check that the PIDs are alive.
+
+        Returns:
+            (execution_id, meta) pairs; the metadata must not be modified
+        """
+        running_dir = self._running_dir(name)
+        try:
+            with self._execution_writes_lock:
+                writes = self._execution_writes.get(name, 0)
+            signature = self._file_signature(os.stat(running_dir)) + (writes,)
+            cached = self._marked_running_cache.get(name)
+            if cached is not None and cached[0] == signature:
+                return list(cached[1])
+            with os.scandir(running_dir) as entries:
+                execution_ids = [entry.name for entry in entries]
+        except FileNotFoundError:
+            self._marked_running_cache.pop(name, None)
+            return []
+
+        marked = []
+        for execution_id in execution_ids:
+            meta = self.read_execution_meta(name, execution_id)
+            if execution_marked_running(meta):
+                marked.append((execution_id, meta))
+        self._marked_running_cache[name] = (signature, marked)
+        return list(marked)
+
+    def delete_execution_files(self, name: str, execution_id: str) -> int:
+        """Delete the logs and metadata of an execution.
+
+        Returns:
+            Number of files deleted
+        """
+        exec_dir = self.logs_dir / name
+        deleted = 0
+        for suffix in EXECUTION_FILE_SUFFIXES:
+            try:
+                (exec_dir / f"{execution_id}{suffix}").unlink()
+                deleted += 1
+            except FileNotFoundError:
+                pass
+        try:
+            (self._running_dir(name) / execution_id).unlink()
+        except FileNotFoundError:
+            pass
+        if deleted:
+            self._note_execution_write(name)
+        return deleted
+
     def list_all_users(self) -> List[int]:
         """List all user IDs that have registered processes (root only).
 
@@ -119,15 +429,14 @@ class Storage:
         if self.uid != 0:
             raise PermissionError("Only root can list all users")
 
-        users_dir = self.base_data_dir / "users"
-        if not users_dir.exists():
+        # scandir entries carry the file type, so no stat per user directory
+        try:
+            with os.scandir(self.base_data_dir / "users") as entries:
+                uids = [int(entry.name) for entry in entries
+                        if entry.name.isdigit() and entry.is_dir()]
+        except FileNotFoundError:
             return []
 
-        uids = []
-        for uid_dir in users_dir.iterdir():
-            if uid_dir.is_dir() and uid_dir.name.isdigit():
-                uids.append(int(uid_dir.name))
-
         return sorted(uids)
 
     def list_all_processes(self) -> List[Dict]:
@@ -146,16 +455,24 @@ class Storage:
 
         all_processes = []
         for uid in self.list_all_users():
-            user_storage = Storage(uid=uid)
-            processes = user_storage.list_processes()
-
-            # Add username for display
-            for proc in processes:
+            # Read the registry directly: a full Storage would create the
+            # user's directories and registry file just to list them
+            if uid == self.uid:
+                processes = self.list_processes()
+            else:
                 try:
-                    username = pwd.getpwuid(uid).pw_name
-                    proc['owner_username'] = username
-                except KeyError:
-                    proc['owner_username'] = f"uid:{uid}"
+                    with open(self._registry_path(self.base_data_dir, uid), 'rb') as f:
+                        processes = list(load_json(f.read()).values())
+                except FileNotFoundError:
+                    continue
+
+            # Add username for display, resolved once per user
+            try:
+                username = getpwuid(uid).pw_name
+            except KeyError:
+                username = f"uid:{uid}"
+            for proc in processes:
+                proc['owner_username'] = username
 
             all_processes.extend(processes)
 
@@ -164,6 +481,6 @@ class Storage:
     def get_username(self) -> str:
         """Get the username for this storage instance's UID."""
         try:
-            return pwd.getpwuid(self.uid).pw_name
+            return getpwuid(self.uid).pw_name
         except KeyError:
             return f"uid:{self.uid}"
@@ -0,0 +1,24 @@
+"""Cached system user database lookups."""
+
+import pwd
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1024)
+def getpwnam(username: str) -> pwd.struct_passwd:
+    """Look up a password database entry by username.
+
+    Results are memoized so NSS backends (LDAP, SSSD) are consulted
+    once per user. Misses raise KeyError and are not cached.
+    """
+    return pwd.getpwnam(username)
+
+
+@lru_cache(maxsize=1024)
+def getpwuid(uid: int) -> pwd.struct_passwd:
+    """Look up a password database entry by UID.
+
+    Results are memoized so NSS backends (LDAP, SSSD) are consulted
+    once per user. Misses raise KeyError and are not cached.
+    """
+    return pwd.getpwuid(uid)
@@ -1,38 +1,291 @@
 """Web interface for ProcOrg."""
 
+import gzip
 import threading
 import time
+import logging
 import os
 import secrets
-from flask import Flask, render_template, jsonify, request, redirect, url_for
-from flask_socketio import SocketIO, emit
+from typing import Dict, Optional, Tuple
+from flask import Flask, render_template, jsonify, request, redirect, send_file, session, url_for
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import generate_etag
+from flask_socketio import SocketIO, emit, join_room
 from flask_cors import CORS
-from flask_session import Session
-from .storage import Storage
-from .manager import ProcessManager
+from .storage import Storage, execution_marked_running
+from .manager import ProcessManager, execution_alive, live_pids, parse_execution_start
 from .scheduler import Scheduler
 from .auth import (
     authenticate_user, get_current_user, require_auth,
     init_session, clear_session
 )
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; Flask's stdlib-json provider is used instead
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson.
+
+    Keeps the default provider's sorted keys and compact output, and falls
+    back to its default() for types orjson doesn't know.
+    """
+
+    def _options(self, indent: bool = False) -> int:
+        # Datetimes go through default() so they keep Flask's HTTP-date format
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default,
+                            option=self._options('indent' in kwargs)).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self._options(indent)) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+# Per-connection chatter goes through logging at DEBUG level, so it costs
+# nothing unless enabled; other messages still print
+logger = logging.getLogger(__name__)
+
+
+# Where the generated session signing key is kept when PROCORG_SECRET_KEY is unset
+SECRET_KEY_FILE = os.path.join('data', '.secret_key')
+
+
+def _load_secret_key() -> str:
+    """Return the session signing key, generating and saving it once.
+
+    PROCORG_SECRET_KEY wins if set. Otherwise the key is read from
+    SECRET_KEY_FILE, so sessions survive restarts and every worker of a
+    server signs with the same key. The first process to start creates
+    the file (mode 0600); link() makes that atomic, so concurrent
+    workers all end up with the winner's key.
+    """
+    key = os.environ.get('PROCORG_SECRET_KEY')
+    if key:
+        return key
+
+    try:
+        with open(SECRET_KEY_FILE) as f:
+            key = f.read().strip()
+        if key:
+            return key
+    except FileNotFoundError:
+        pass
+
+    os.makedirs(os.path.dirname(SECRET_KEY_FILE), exist_ok=True)
+    tmp_path = f'{SECRET_KEY_FILE}.{os.getpid()}.tmp'
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.write(fd, secrets.token_hex(32).encode())
+    finally:
+        os.close(fd)
+    try:
+        os.link(tmp_path, SECRET_KEY_FILE)
+    except FileExistsError:
+        pass  # Another worker saved its key first; use that one
+    finally:
+        os.unlink(tmp_path)
+
+    with open(SECRET_KEY_FILE) as f:
+        return f.read().strip()
+
 
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 
-# Generate secure random secret key if not set
-app.config['SECRET_KEY'] = os.environ.get('PROCORG_SECRET_KEY') or secrets.token_hex(32)
+app.config['SECRET_KEY'] = _load_secret_key()
 
-# Session configuration
-app.config['SESSION_TYPE'] = 'filesystem'
-app.config['SESSION_FILE_DIR'] = './data/flask_session'
-app.config['SESSION_PERMANENT'] = True
+# Session configuration. Sessions only hold the logged-in user, so by
+# default they live in Flask's signed cookie and no session store is read
+# or written per request. PROCORG_SESSION_TYPE (e.g. redis, filesystem)
+# switches to server-side sessions via Flask-Session.
 app.config['PERMANENT_SESSION_LIFETIME'] = 86400  # 24 hours
+app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
+
+session_type = os.environ.get('PROCORG_SESSION_TYPE')
+if session_type:
+    from flask_session import Session
+    app.config['SESSION_TYPE'] = session_type
+    app.config['SESSION_PERMANENT'] = True
+    if session_type == 'redis':
+        import redis
+        app.config['SESSION_REDIS'] = redis.Redis.from_url(
+            os.environ.get('PROCORG_REDIS_URL', 'redis://localhost:6379/0'))
+    elif session_type == 'filesystem':
+        app.config['SESSION_FILE_DIR'] = './data/flask_session'
+    Session(app)
+
+# Compress JSON and text responses larger than this for clients that accept
+# gzip; smaller bodies aren't worth the CPU
+app.config['COMPRESS_MIN_SIZE'] = 512
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/html', 'text/plain', 'text/css',
+                          'application/javascript')
 
-Session(app)
 CORS(app)
-socketio = SocketIO(app, cors_allowed_origins="*")
+# PROCORG_ASYNC_MODE=gevent|eventlet serves requests from green threads
+# instead of one OS thread each; unset picks the best installed mode.
+# PROCORG_MESSAGE_QUEUE (e.g. redis://localhost:6379/1) relays emits
+# between several server processes.
+socketio = SocketIO(app, cors_allowed_origins="*",
+                    async_mode=os.environ.get('PROCORG_ASYNC_MODE') or None,
+                    message_queue=os.environ.get('PROCORG_MESSAGE_QUEUE') or None)
+
+
+@app.after_request
+def compress_response(response):
+    """Gzip large JSON and text responses for clients that accept it."""
+    response.vary.add('Accept-Encoding')
+    if (response.status_code != 200 or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or 'gzip' not in request.accept_encodings):
+        return response
+
+    data = response.get_data()
+    if len(data) < app.config['COMPRESS_MIN_SIZE']:
+        return response
+
+    response.set_data(gzip.compress(data, compresslevel=6))
+    response.headers['Content-Encoding'] = 'gzip'
+    # The compressed body differs byte for byte, so an ETag can only be weak
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+# Per-user storage, manager and scheduler, created on a user's first request
+# and shared by all later ones
+_user_services: Dict[int, Tuple[Storage, ProcessManager, Scheduler]] = {}
+_user_services_lock = threading.Lock()
+
+# How long a user's /api/processes result is reused by later polls; changes
+# made through the API drop it right away
+PROCESSES_CACHE_TTL = 1.0
+
+# uid -> (expiry on the monotonic clock, ETag, encoded merged process list),
+# so a cache hit sends the stored bytes without encoding anything
+_processes_cache: Dict[int, Tuple[float, str, bytes]] = {}
+
+
+def _invalidate_processes_cache(uid: int) -> None:
+    """Forget a user's cached /api/processes result after a change."""
+    _processes_cache.pop(uid, None)
+
+
+def _get_user_services(uid: int) -> Tuple[Storage, ProcessManager, Scheduler]:
+    """Return the storage, manager and scheduler of a user, creating them once."""
+    services = _user_services.get(uid)
+    if services is None:
+        with _user_services_lock:
+            services = _user_services.get(uid)
+            if services is None:
+                storage = Storage(uid=uid)
+                manager = ProcessManager(storage, uid=uid)
+                services = (storage, manager, Scheduler(storage, manager))
+                _user_services[uid] = services
+    return services
+
+
+def get_user_storage(uid: int) -> Storage:
+    """Return the shared Storage of a user.
+
+    Reusing one instance per UID skips the directory setup of a fresh
+    Storage on every request and keeps its parsed registry cache warm;
+    the cache still re-reads the file whenever it changes on disk.
+    """
+    return _get_user_services(uid)[0]
+
+
+def get_user_manager(uid: int) -> ProcessManager:
+    """Return the shared ProcessManager of a user.
+
+    Executions started by one request stay tracked in memory for the
+    user's later requests instead of being rediscovered from disk.
+    """
+    return _get_user_services(uid)[1]
+
+
+def get_user_scheduler(uid: int) -> Scheduler:
+    """Return the shared Scheduler of a user, so start/stop/info act on one instance."""
+    return _get_user_services(uid)[2]
+
+
+def _conditional_json(data, max_age: int = 0):
+    """Build a JSON response that polling clients can revalidate.
+
+    The response carries an ETag of its body; a request whose
+    If-None-Match matches gets a bodiless 304 instead.
+
+    Args:
+        data: JSON-serializable response data
+        max_age: Seconds the client may reuse the response without asking
+    """
+    body = jsonify(data).get_data()
+    return _conditional_body(body, generate_etag(body), max_age)
 
-# Note: No global storage/manager - created per-user in routes
+
+def _conditional_body(body: bytes, etag: str, max_age: int = 0):
+    """Like _conditional_json, for a JSON body that is already encoded.
+
+    Args:
+        body: Encoded JSON response body
+        etag: ETag of body
+        max_age: Seconds the client may reuse the response without asking
+    """
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'private, max-age={max_age}' if max_age else 'private, no-cache'
+    return response.make_conditional(request)
+
+
+def _authorized_process(user, storage: Storage, name: str, with_success: bool = False):
+    """Look up a process and check that the user may act on it.
+
+    Non-root users may only access their own processes; processes without
+    owner_uid are treated as belonging to the current user (backward
+    compatibility).
+
+    Args:
+        user: Current user
+        storage: The user's storage
+        name: Process name
+        with_success: Include 'success': False in the not-found response
+
+    Returns:
+        (process, None) if allowed, otherwise (None, error response)
+    """
+    proc = storage.get_process(name)
+    denied = _access_error(user, proc)
+    if denied:
+        message, code = denied
+        body = {'success': False, 'error': message} if with_success and code == 404 else {'error': message}
+        return None, (jsonify(body), code)
+    return proc, None
+
+
+def _access_error(user, proc: Optional[Dict]) -> Optional[Tuple[str, int]]:
+    """Return (error message, HTTP status) if the user may not act on proc."""
+    if not proc:
+        return 'Process not found', 404
+    if not user.is_root:
+        proc_owner = proc.get('owner_uid')
+        if proc_owner is not None and proc_owner != user.uid:
+            return 'Permission denied', 403
+    return None
 
 
 @app.route('/')
@@ -99,29 +352,30 @@ def whoami():
 def get_processes():
     """Get all processes with their status (user-specific or all for root)."""
     user = get_current_user()
-    storage = Storage(uid=user.uid)
-    manager = ProcessManager(storage, uid=user.uid)
+    storage = get_user_storage(user.uid)
+    manager = get_user_manager(user.uid)
+
+    # Several tabs polling at once share one result
+    cached = _processes_cache.get(user.uid)
+    if cached is not None and time.monotonic() < cached[0]:
+        return _conditional_body(cached[2], cached[1])
 
     # Root can see all processes
     if user.is_root:
         processes = storage.list_all_processes()
+        statuses = manager.get_all_statuses()
     else:
         processes = storage.list_processes()
-
-    statuses = manager.get_all_statuses()
+        statuses = manager.get_all_statuses(processes)
 
     # Merge process definitions with status
-    result = []
-    for proc in processes:
-        name = proc['name']
-        status = next((s for s in statuses if s['name'] == name), None)
+    status_by_name = {s['name']: s for s in statuses}
+    result = [{**proc, 'status': status_by_name.get(proc['name'])} for proc in processes]
+    body = jsonify(result).get_data()
+    etag = generate_etag(body)
+    _processes_cache[user.uid] = (time.monotonic() + PROCESSES_CACHE_TTL, etag, body)
 
-        result.append({
-            **proc,
-            'status': status
-        })
-
-    return jsonify(result)
+    return _conditional_body(body, etag)
 
 
 @app.route('/api/processes/<name>')
@@ -129,18 +383,13 @@ def get_processes():
 def get_process(name):
     """Get detailed information about a process."""
     user = get_current_user()
-    storage = Storage(uid=user.uid)
-    manager = ProcessManager(storage, uid=user.uid)
-
-    proc = storage.get_process(name)
-    if not proc:
-        return jsonify({'error': 'Process not found'}), 404
+    storage = get_user_storage(user.uid)
+    manager = get_user_manager(user.uid)
 
-    # Verify ownership (non-root can only see their own)
-    # Check ownership: processes without owner_uid are treated as belonging to current user (backward compatibility)
-    proc_owner = proc.get('owner_uid')
-    if not user.is_root and proc_owner is not None and proc_owner != user.uid:
-        return jsonify({'error': 'Permission denied'}), 403
+    # Verify the process exists and the user may act on it
+    proc, error = _authorized_process(user, storage, name)
+    if error:
+        return error
 
     status = manager.get_process_status(name)
 
@@ -150,12 +399,89 @@ def get_process(name):
     })
 
 
+# Largest 'lines' a batch item may ask for
+BATCH_MAX_LINES = 10000
+
+
+def _batch_item_error(item) -> Optional[str]:
+    """Return why a /api/processes/batch item is malformed, or None if it is valid."""
+    if not isinstance(item, dict):
+        return 'each item must be an object'
+    if not isinstance(item.get('name'), str):
+        return "'name' must be a string"
+    streams = item.get('streams', ['stdout'])
+    if (not isinstance(streams, list) or not streams
+            or any(stream not in ('stdout', 'stderr') for stream in streams)):
+        return "'streams' must be a non-empty list of 'stdout' and 'stderr'"
+    lines = item.get('lines', 100)
+    if isinstance(lines, bool) or not isinstance(lines, int) or not 0 < lines <= BATCH_MAX_LINES:
+        return f"'lines' must be an integer from 1 to {BATCH_MAX_LINES}"
+    return None
+
+
+@app.route('/api/processes/batch', methods=['POST'])
+@require_auth
+def get_processes_batch():
+    """Get status and latest logs of several processes in one request.
+
+    Expects {"items": [{"name": ..., "streams": ["stdout", "stderr"],
+    "lines": 100}, ...]}; streams defaults to ["stdout"] and lines to 100.
+    A malformed item fails the whole request with 400; items the user
+    may not access carry an 'error' instead of data.
+    """
+    user = get_current_user()
+    storage = get_user_storage(user.uid)
+    manager = get_user_manager(user.uid)
+
+    data = request.get_json(silent=True)
+    items = data.get('items') if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        return jsonify({'error': 'items must be a list'}), 400
+    for index, item in enumerate(items):
+        invalid = _batch_item_error(item)
+        if invalid:
+            return jsonify({'error': f'items[{index}]: {invalid}'}), 400
+
+    # Check access to every item first, so statuses come from one snapshot
+    allowed = {}
+    errors = {}
+    for item in items:
+        name = item['name']
+        if name in allowed or name in errors:
+            continue
+        proc = storage.get_process(name)
+        denied = _access_error(user, proc)
+        if denied:
+            errors[name] = denied[0]
+        else:
+            allowed[name] = proc
+
+    status_by_name = {s['name']: s for s in manager.get_all_statuses(list(allowed.values()))}
+
+    results = []
+    for item in items:
+        name = item['name']
+        if name not in allowed:
+            results.append({'name': name, 'error': errors[name]})
+            continue
+
+        lines = item.get('lines', 100)
+        results.append({
+            **allowed[name],
+            'status': status_by_name.get(name),
+            'logs': {stream: manager.get_latest_logs(name, stream, lines)
+                     for stream in item.get('streams', ['stdout'])}
+        })
+
+    return jsonify({'items': results})
+
+
 @app.route('/api/processes', methods=['POST'])
 @require_auth
 def register_process():
     """Register a new process."""
     user = get_current_user()
-    storage = Storage(uid=user.uid)
+    storage = get_user_storage(user.uid)
 
     data = request.get_json()
 
@@ -177,6 +503,8 @@ def register_process():
 
     try:
         storage.register_process(name, script_path, cron_expr, description)
+        _invalidate_processes_cache(user.uid)
+        get_user_scheduler(user.uid).wake()
         return jsonify({'success': True, 'name': name})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -187,19 +515,16 @@ def register_process():
 def unregister_process(name):
     """Unregister a process."""
     user = get_current_user()
-    storage = Storage(uid=user.uid)
+    storage = get_user_storage(user.uid)
 
-    # Verify ownership before deleting
-    proc = storage.get_process(name)
-    if not proc:
-        return jsonify({'success': False, 'error': 'Process not found'}), 404
-
-    # Check ownership: processes without owner_uid are treated as belonging to current user (backward compatibility)
-    proc_owner = proc.get('owner_uid')
-    if not user.is_root and proc_owner is not None and proc_owner != user.uid:
-        return jsonify({'error': 'Permission denied'}), 403
+    # Verify the process exists and the user may act on it
+    proc, error = _authorized_process(user, storage, name, with_success=True)
+    if error:
+        return error
 
     success = storage.unregister_process(name)
+    _invalidate_processes_cache(user.uid)
+    get_user_scheduler(user.uid).wake()
 
     if success:
         return jsonify({'success': True})
@@ -212,24 +537,20 @@ def unregister_process(name):
 def run_process(name):
     """Run a process manually."""
     user = get_current_user()
-    storage = Storage(uid=user.uid)
-    manager = ProcessManager(storage, uid=user.uid)
+    storage = get_user_storage(user.uid)
+    manager = get_user_manager(user.uid)
 
     # Get optional args from request
     data = request.get_json() or {}
     args = data.get('args', [])
 
-    # Verify ownership
-    proc = storage.get_process(name)
-    if not proc:
-        return jsonify({'success': False, 'error': 'Process not found'}), 404
-
-    # Check ownership: processes without owner_uid are treated as belonging to current user (backward compatibility)
-    proc_owner = proc.get('owner_uid')
-    if not user.is_root and proc_owner is not None and proc_owner != user.uid:
-        return jsonify({'error': 'Permission denied'}), 403
+    # Verify the process exists and the user may act on it
+    proc, error = _authorized_process(user, storage, name, with_success=True)
+    if error:
+        return error
 
     execution = manager.run_process(name, args=args)
+    _invalidate_processes_cache(user.uid)
 
     if execution:
         return jsonify({
@@ -245,8 +566,8 @@ def run_process(name):
 def get_running_processes():
     """Get all running processes grouped by name."""
     user = get_current_user()
-    storage = Storage(uid=user.uid)
-    manager = ProcessManager(storage, uid=user.uid)
+    storage = get_user_storage(user.uid)
+    manager = get_user_manager(user.uid)
 
     # Get all processes
     if user.is_root:
@@ -254,71 +575,50 @@ def get_running_processes():
     else:
         processes = storage.list_processes()
 
-    # Build grouped running processes
+    return jsonify(_running_groups(storage, manager, processes))
+
+
+def _running_groups(storage: Storage, manager: ProcessManager, processes: list) -> list:
+    """Group the running executions of processes by process name.
+
+    In-memory executions are combined with ones other requests or the CLI
+    started, found through their execution metadata.
+    """
     running_groups = []
+    live = None  # Snapshot of live PIDs, taken once the first candidate shows up
     for proc in processes:
         name = proc['name']
 
         # Get all running executions for this process from in-memory
-        running_execs = []
-        with manager.lock:
-            if name in manager.executions:
-                for execution in manager.executions[name]:
-                    if execution.status == "running":
-                        running_execs.append(execution.get_info())
+        running_execs = manager.get_running_executions(name)
 
         # Also check filesystem for ALL running executions started by other requests
-        exec_dir = storage.logs_dir / name
-        if exec_dir.exists():
-            # Find all PID files for this process
-            pid_files = list(exec_dir.glob("*.pid"))
-            for pid_file in pid_files:
-                # Extract execution_id from filename (e.g., "20231121_143025_123456.pid")
-                execution_id = pid_file.stem
-
-                # Check if already in running_execs from in-memory
-                if any(e['execution_id'] == execution_id for e in running_execs):
-                    continue
-
-                try:
-                    with open(pid_file, 'r') as f:
-                        pid = int(f.read().strip())
-
-                    # Check if process is still running
-                    try:
-                        os.kill(pid, 0)
-                        # Process exists, parse execution info from filesystem
-                        date_part = execution_id.split('_')[0]
-                        time_part = execution_id.split('_')[1]
-                        start_time_str = f"{date_part[:4]}-{date_part[4:6]}-{date_part[6:8]} {time_part[:2]}:{time_part[2:4]}:{time_part[4:6]}"
-                        from datetime import datetime
-                        start_time = datetime.strptime(start_time_str, "%Y-%m-%d %H:%M:%S").isoformat()
-
-                        # Load args from file if exists
-                        args = []
-                        args_file = exec_dir / f"{execution_id}.args"
-                        if args_file.exists():
-                            try:
-                                with open(args_file, 'r') as f:
-                                    args = [line.strip() for line in f.readlines() if line.strip()]
-                            except:
-                                pass
-
-                        running_execs.append({
-                            "execution_id": execution_id,
-                            "name": name,
-                            "pid": pid,
-                            "status": "running",
-                            "args": args,
-                            "start_time": start_time,
-                            "end_time": None,
-                            "exit_code": None,
-                            "duration": None
-                        })
-                    except OSError:
-                        pass  # Process not running
-                except (ValueError, FileNotFoundError):
-                    pass
+        known_ids = {e['execution_id'] for e in running_execs}
+        for execution_id, meta in storage.list_marked_running(name):
+            # Skip executions already found in memory
+            if execution_id in known_ids:
+                continue
+
+            # Check if process is still running
+            if live is None:
+                live = live_pids()
+            if not execution_alive(meta, live):
+                continue
+
+            # Executions started by older versions only encode it in the ID
+            start_time = meta.get('start_time') or parse_execution_start(execution_id)
+
+            running_execs.append({
+                "execution_id": execution_id,
+                "name": name,
+                "pid": meta['pid'],
+                "status": "running",
+                "args": meta['args'],
+                "start_time": start_time,
+                "end_time": None,
+                "exit_code": None,
+                "duration": None
+            })
 
         if running_execs:
             running_groups.append({
@@ -328,7 +628,7 @@ def get_running_processes():
                 'instances': running_execs
             })
 
-    return jsonify(running_groups)
+    return running_groups
 
 
 @app.route('/api/processes/stopped')
@@ -336,7 +636,7 @@ def get_running_processes():
 def get_stopped_processes():
     """Get all stopped processes with available logs."""
     user = get_current_user()
-    storage = Storage(uid=user.uid)
+    storage = get_user_storage(user.uid)
 
     # Get all processes
     if user.is_root:
@@ -353,44 +653,18 @@ def get_stopped_processes():
             continue
 
         # Find all executions with logs
-        log_files = list(exec_dir.glob("*.stdout.log"))
         stopped_execs = []
 
-        for log_file in log_files:
-            execution_id = log_file.stem.replace('.stdout', '')
-            pid_file = exec_dir / f"{execution_id}.pid"
+        for execution_id in storage.list_execution_ids(name):
+            meta = storage.read_execution_meta(name, execution_id)
 
-            # Only include if not currently running (no PID file)
-            if not pid_file.exists():
-                # Parse start time from execution_id
-                try:
-                    date_part = execution_id.split('_')[0]
-                    time_part = execution_id.split('_')[1]
-                    start_time_str = f"{date_part[:4]}-{date_part[4:6]}-{date_part[6:8]} {time_part[:2]}:{time_part[2:4]}:{time_part[4:6]}"
-                    from datetime import datetime
-                    start_time = datetime.strptime(start_time_str, "%Y-%m-%d %H:%M:%S").isoformat()
-                except (IndexError, ValueError):
-                    start_time = None
-
-                # Read exit code
-                exit_code = None
-                exitcode_file = exec_dir / f"{execution_id}.exitcode"
-                if exitcode_file.exists():
-                    try:
-                        with open(exitcode_file, 'r') as f:
-                            exit_code = int(f.read().strip())
-                    except (ValueError, FileNotFoundError):
-                        pass
-
-                # Read args from file if exists
-                args = []
-                args_file = exec_dir / f"{execution_id}.args"
-                if args_file.exists():
-                    try:
-                        with open(args_file, 'r') as f:
-                            args = [line.strip() for line in f.readlines() if line.strip()]
-                    except:
-                        pass
+            # Only include if not currently running
+            if not execution_marked_running(meta):
+                # Executions started by older versions only encode it in the ID
+                start_time = meta.get('start_time') or parse_execution_start(execution_id)
+
+                exit_code = meta['exit_code']
+                args = meta['args']
 
                 stopped_execs.append({
                     "execution_id": execution_id,
@@ -419,7 +693,7 @@ def get_stopped_processes():
 def clear_stopped_processes():
     """Clear all stopped process logs."""
     user = get_current_user()
-    storage = Storage(uid=user.uid)
+    storage = get_user_storage(user.uid)
 
     # Get all processes
     if user.is_root:
@@ -436,24 +710,16 @@ def clear_stopped_processes():
             continue
 
         # Find all executions with logs (that aren't running)
-        log_files = list(exec_dir.glob("*.stdout.log"))
-
-        for log_file in log_files:
-            execution_id = log_file.stem.replace('.stdout', '')
-            pid_file = exec_dir / f"{execution_id}.pid"
-
+        for execution_id in storage.list_execution_ids(name):
             # Only delete if not currently running
-            if not pid_file.exists():
+            if not execution_marked_running(storage.read_execution_meta(name, execution_id)):
                 # Delete all related files for this execution
-                for ext in ['.stdout.log', '.stderr.log', '.exitcode', '.args']:
-                    file_path = exec_dir / f"{execution_id}{ext}"
-                    if file_path.exists():
-                        try:
-                            file_path.unlink()
-                            deleted_count += 1
-                        except Exception as e:
-                            print(f"Error deleting {file_path}: {e}")
+                try:
+                    deleted_count += storage.delete_execution_files(name, execution_id)
+                except Exception as e:
+                    print(f"Error deleting logs of {name}/{execution_id}: {e}")
 
+    _invalidate_processes_cache(user.uid)
     return jsonify({'success': True, 'deleted_files': deleted_count})
 
 
@@ -462,38 +728,28 @@ def clear_stopped_processes():
 def delete_execution(name, execution_id):
     """Delete logs for a specific execution."""
     user = get_current_user()
-    storage = Storage(uid=user.uid)
+    storage = get_user_storage(user.uid)
 
-    # Verify process exists and user has permission
-    proc = storage.get_process(name)
-    if not proc:
-        return jsonify({'success': False, 'error': 'Process not found'}), 404
-
-    # Check ownership
-    proc_owner = proc.get('owner_uid')
-    if not user.is_root and proc_owner is not None and proc_owner != user.uid:
-        return jsonify({'error': 'Permission denied'}), 403
+    # Verify the process exists and the user may act on it
+    proc, error = _authorized_process(user, storage, name, with_success=True)
+    if error:
+        return error
 
     exec_dir = storage.logs_dir / name
     if not exec_dir.exists():
         return jsonify({'success': False, 'error': 'No logs found'}), 404
 
     # Check if execution is still running
-    pid_file = exec_dir / f"{execution_id}.pid"
-    if pid_file.exists():
+    if execution_marked_running(storage.read_execution_meta(name, execution_id)):
         return jsonify({'success': False, 'error': 'Cannot delete logs for running process'}), 400
 
     # Delete all related files for this execution
-    deleted_count = 0
-    for ext in ['.stdout.log', '.stderr.log', '.exitcode', '.args']:
-        file_path = exec_dir / f"{execution_id}{ext}"
-        if file_path.exists():
-            try:
-                file_path.unlink()
-                deleted_count += 1
-            except Exception as e:
-                print(f"Error deleting {file_path}: {e}")
-                return jsonify({'success': False, 'error': f'Failed to delete file: {e}'}), 500
+    try:
+        deleted_count = storage.delete_execution_files(name, execution_id)
+        _invalidate_processes_cache(user.uid)
+    except Exception as e:
+        print(f"Error deleting logs of {name}/{execution_id}: {e}")
+        return jsonify({'success': False, 'error': f'Failed to delete file: {e}'}), 500
 
     if deleted_count == 0:
         return jsonify({'success': False, 'error': 'No logs found for this execution'}), 404
@@ -506,20 +762,16 @@ def delete_execution(name, execution_id):
 def stop_process(name):
     """Stop a running process."""
     user = get_current_user()
-    storage = Storage(uid=user.uid)
-    manager = ProcessManager(storage, uid=user.uid)
+    storage = get_user_storage(user.uid)
+    manager = get_user_manager(user.uid)
 
-    # Verify ownership
-    proc = storage.get_process(name)
-    if not proc:
-        return jsonify({'success': False, 'error': 'Process not found'}), 404
-
-    # Check ownership: processes without owner_uid are treated as belonging to current user (backward compatibility)
-    proc_owner = proc.get('owner_uid')
-    if not user.is_root and proc_owner is not None and proc_owner != user.uid:
-        return jsonify({'error': 'Permission denied'}), 403
+    # Verify the process exists and the user may act on it
+    proc, error = _authorized_process(user, storage, name, with_success=True)
+    if error:
+        return error
 
     success = manager.stop_process(name)
+    _invalidate_processes_cache(user.uid)
 
     return jsonify({'success': success})
 
@@ -527,23 +779,34 @@ def stop_process(name):
 @app.route('/api/processes/<name>/logs/<stream>')
 @require_auth
 def get_logs(name, stream):
-    """Get logs for a process."""
-    user = get_current_user()
-    storage = Storage(uid=user.uid)
-    manager = ProcessManager(storage, uid=user.uid)
+    """Get logs for a process.
 
-    # Verify ownership
-    proc = storage.get_process(name)
-    if not proc:
-        return jsonify({'error': 'Process not found'}), 404
+    Returns JSON by default. With ?format=raw the log is sent as
+    text/plain instead: a whole execution log is streamed from the file,
+    and the latest logs are sent as the same tail the JSON would hold.
+    """
+    user = get_current_user()
+    storage = get_user_storage(user.uid)
+    manager = get_user_manager(user.uid)
 
-    # Check ownership: processes without owner_uid are treated as belonging to current user (backward compatibility)
-    proc_owner = proc.get('owner_uid')
-    if not user.is_root and proc_owner is not None and proc_owner != user.uid:
-        return jsonify({'error': 'Permission denied'}), 403
+    # Verify the process exists and the user may act on it
+    proc, error = _authorized_process(user, storage, name)
+    if error:
+        return error
 
     # Get optional execution_id parameter
     execution_id = request.args.get('execution_id')
+    if execution_id and '/' in execution_id:
+        return jsonify({'error': 'Invalid execution_id'}), 400
+    raw = request.args.get('format') == 'raw'
+
+    if execution_id and raw:
+        # Let the server send the file itself instead of reading it into memory
+        log_path = storage.get_execution_log_path(name, execution_id, stream)
+        if not log_path.exists():
+            return '', 200, {'Content-Type': 'text/plain; charset=utf-8'}
+        # send_file resolves relative paths against the package, not the cwd
+        return send_file(log_path.absolute(), mimetype='text/plain', conditional=True, max_age=1)
 
     if execution_id:
         # Get logs for specific execution
@@ -553,11 +816,17 @@ def get_logs(name, stream):
         lines = request.args.get('lines', 100, type=int)
         log_content = manager.get_latest_logs(name, stream, lines)
 
-    return jsonify({
+    if raw:
+        response = app.response_class(log_content, mimetype='text/plain')
+        response.add_etag()
+        response.headers['Cache-Control'] = 'private, max-age=1'
+        return response.make_conditional(request)
+
+    return _conditional_json({
         'name': name,
         'stream': stream,
         'content': log_content
-    })
+    }, max_age=1)
 
 
 @app.route('/api/scheduler')
@@ -565,11 +834,9 @@ def get_logs(name, stream):
 def get_scheduler_info():
     """Get scheduler information."""
     user = get_current_user()
-    storage = Storage(uid=user.uid)
-    manager = ProcessManager(storage, uid=user.uid)
-    scheduler = Scheduler(storage, manager)
+    scheduler = get_user_scheduler(user.uid)
 
-    return jsonify(scheduler.get_schedule_info())
+    return _conditional_json(scheduler.get_schedule_info())
 
 
 @app.route('/api/scheduler/start', methods=['POST'])
@@ -577,9 +844,7 @@ def get_scheduler_info():
 def start_scheduler():
     """Start the scheduler."""
     user = get_current_user()
-    storage = Storage(uid=user.uid)
-    manager = ProcessManager(storage, uid=user.uid)
-    scheduler = Scheduler(storage, manager)
+    scheduler = get_user_scheduler(user.uid)
 
     scheduler.start()
     return jsonify({'success': True})
@@ -590,31 +855,110 @@ def start_scheduler():
 def stop_scheduler():
     """Stop the scheduler."""
     user = get_current_user()
-    storage = Storage(uid=user.uid)
-    manager = ProcessManager(storage, uid=user.uid)
-    scheduler = Scheduler(storage, manager)
+    scheduler = get_user_scheduler(user.uid)
 
     scheduler.stop()
     return jsonify({'success': True})
 
 
+# How often connected users' process statuses are checked for changes
+STATUS_BROADCAST_INTERVAL = 2.0
+
+# Socket.IO session id -> uid of each connected, logged-in client
+_client_uids: Dict[str, int] = {}
+_client_uids_lock = threading.Lock()
+_broadcaster_started = False
+
+
+def _status_room(uid: int) -> str:
+    """Socket.IO room that a user's clients join."""
+    return f'uid:{uid}'
+
+
 def broadcast_status_updates():
-    """Background thread to broadcast status updates to connected clients.
+    """Background task that tells clients when their processes change.
 
-    Note: Disabled in multi-user mode. Status updates are handled via
-    client-side polling of /api/processes endpoint instead.
+    Every STATUS_BROADCAST_INTERVAL seconds, the dashboard state of each
+    user with a connected client (see _dashboard_state) is compared with
+    the previous check, and a 'status_update' event goes to that user's
+    room only if it differs. Clients then refetch what they display.
     """
-    # Disabled - no global manager in multi-user mode
-    pass
+    last_states: Dict[int, tuple] = {}
+    while True:
+        socketio.sleep(STATUS_BROADCAST_INTERVAL)
+        with _client_uids_lock:
+            uids = set(_client_uids.values())
+        for uid in list(last_states):
+            if uid not in uids:
+                del last_states[uid]
+
+        for uid in uids:
+            try:
+                state = _dashboard_state(uid)
+            except Exception as e:
+                print(f"Status broadcast error for uid {uid}: {e}")
+                continue
+            if uid in last_states and state != last_states[uid]:
+                socketio.emit('status_update', {}, to=_status_room(uid))
+            last_states[uid] = state
+
+
+def _dashboard_state(uid: int) -> tuple:
+    """Summarize what a user's dashboard shows, for change detection.
+
+    Covers the same processes the API lists for the user (every user's
+    for root): their definitions, their statuses, which hold the latest
+    execution of each, and the IDs of all running executions, so an older concurrent
+    instance exiting is noticed even while a newer one keeps running.
+    """
+    storage = get_user_storage(uid)
+    manager = get_user_manager(uid)
+    if uid == 0:
+        processes = storage.list_all_processes()
+        statuses = manager.get_all_statuses()
+    else:
+        processes = storage.list_processes()
+        statuses = manager.get_all_statuses(processes)
+    running = sorted((group['name'], instance['execution_id'])
+                     for group in _running_groups(storage, manager, processes)
+                     for instance in group['instances'])
+    return processes, statuses, running
+
+
+def _start_broadcaster():
+    """Start broadcast_status_updates once per server process."""
+    global _broadcaster_started
+    with _client_uids_lock:
+        if _broadcaster_started:
+            return
+        _broadcaster_started = True
+    socketio.start_background_task(broadcast_status_updates)
 
 
 @socketio.on('connect')
 def handle_connect():
-    """Handle client connection."""
-    print('Client connected')
+    """Handle client connection.
+
+    Logged-in clients join their user's room to receive status updates.
+    """
+    logger.debug('Client connected')
+    user_data = session.get('user')
+    if user_data is not None:
+        uid = user_data['uid']
+        join_room(_status_room(uid))
+        with _client_uids_lock:
+            _client_uids[request.sid] = uid
+        _start_broadcaster()
     emit('connected', {'data': 'Connected to ProcOrg'})
 
 
+@socketio.on('disconnect')
+def handle_disconnect(reason=None):
+    """Stop checking a user's statuses once their last client is gone."""
+    with _client_uids_lock:
+        _client_uids.pop(request.sid, None)
+
+
 @socketio.on('subscribe_logs')
 def handle_subscribe_logs(data):
     """Subscribe to real-time log updates for a process.
@@ -625,7 +969,8 @@ def handle_subscribe_logs(data):
     name = data.get('name')
     stream = data.get('stream', 'stdout')
 
-    print(f"Client subscribed to logs for {name}/{stream} (WebSocket log streaming disabled in multi-user mode)")
+    logger.debug("Client subscribed to logs for %s/%s (WebSocket log streaming disabled in multi-user mode)",
+                 name, stream)
 
     # Disabled - clients should use REST API instead
     emit('log_update', {
@@ -637,10 +982,8 @@ def handle_subscribe_logs(data):
 
 def run_server(host='0.0.0.0', port=9777, debug=False):
     """Run the web server."""
-    # Note: Background status updates disabled in multi-user mode
-    # Status updates are handled via client-side polling
-
-    print(f"Starting ProcOrg web server on http://{host}:{port}")
+    print(f"Starting ProcOrg web server on http://{host}:{port} "
+          f"(async mode: {socketio.async_mode})")
     socketio.run(app, host=host, port=port, debug=debug, allow_unsafe_werkzeug=True)
 
 
@@ -15,6 +15,52 @@ import shutil
 import sys
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Optional speedup, as in procorg.storage
+    orjson = None
+
+# ioctl that makes dst share src's extents on copy-on-write filesystems
+# (Btrfs, XFS with reflink); from <linux/fs.h>
+FICLONE = 0x40049409
+
+
+def _copy_in_kernel(fsrc, fdst):
+    """Copy an open file with os.copy_file_range, without going through user space.
+
+    Raises:
+        OSError: If the kernel or filesystem can't copy this pair of files
+    """
+    size = os.fstat(fsrc.fileno()).st_size
+    copied = 0
+    while copied < size:
+        n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), size - copied)
+        if n == 0:
+            break
+        copied += n
+
+
+def _clone_or_copy(src, dst):
+    """copytree copy_function that avoids copying data through Python.
+
+    Tries, in order: a reflink (FICLONE; copies only metadata on
+    Btrfs and reflink-enabled XFS), os.copy_file_range (an in-kernel copy
+    that filesystems may also offload), and finally shutil.copy2.
+    """
+    try:
+        import fcntl
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            except OSError:
+                if not hasattr(os, 'copy_file_range'):
+                    raise
+                _copy_in_kernel(fsrc, fdst)
+    except (ImportError, OSError):
+        return shutil.copy2(src, dst)
+    shutil.copystat(src, dst)
+    return dst
+
 
 def main():
     """Run the migration."""
@@ -59,7 +105,7 @@ def main():
         shutil.rmtree(backup_dir)
 
     print(f"Creating backup: {backup_dir}")
-    shutil.copytree(base_dir / "data", backup_dir)
+    shutil.copytree(base_dir / "data", backup_dir, copy_function=_clone_or_copy)
     print("✓ Backup created")
     print()
 
@@ -79,44 +125,61 @@ def main():
     print("Migrating processes.json...")
     new_processes_file = new_user_dir / "processes.json"
 
-    with open(old_processes_file, 'r') as f:
-        processes = json.load(f)
+    data = old_processes_file.read_bytes()
+    processes = orjson.loads(data) if orjson is not None else json.loads(data)
 
     # Add owner_uid to each process
     for proc_name, proc_data in processes.items():
         if 'owner_uid' not in proc_data:
             proc_data['owner_uid'] = current_uid
 
-    with open(new_processes_file, 'w') as f:
-        json.dump(processes, f, indent=2)
+    if orjson is not None:
+        new_processes_file.write_bytes(orjson.dumps(processes, option=orjson.OPT_INDENT_2))
+    else:
+        new_processes_file.write_text(json.dumps(processes, indent=2))
 
     print(f"✓ Migrated {len(processes)} processes")
     print()
 
-    # Migrate logs
+    # Migrate logs. Both trees live under data/, so moving is a rename of
+    # each directory rather than a copy of every log; shutil.move still
+    # falls back to copying if data/users is on another filesystem.
+    # The backup made above keeps the original copy.
     if old_logs_dir.exists():
         print("Migrating logs...")
         log_count = 0
 
-        for process_dir in old_logs_dir.iterdir():
-            if process_dir.is_dir():
+        with os.scandir(old_logs_dir) as process_dirs:
+            for process_dir in process_dirs:
+                if not process_dir.is_dir():
+                    continue
                 dest_dir = new_user_logs_dir / process_dir.name
-                shutil.copytree(process_dir, dest_dir)
-                log_count += sum(1 for _ in dest_dir.glob("*.log"))
+                if dest_dir.exists():
+                    print(f"! Skipping {process_dir.name}: {dest_dir} already exists")
+                    continue
+                with os.scandir(process_dir.path) as entries:
+                    log_count += sum(1 for entry in entries if entry.name.endswith(".log"))
+                shutil.move(process_dir.path, str(dest_dir))
 
         print(f"✓ Migrated {log_count} log files")
         print()
 
-    # Remove old structure
-    print("Removing old structure...")
-    response = input("  Proceed with removing old data? [y/N]: ")
+    # Remove what is left of the old structure. The per-process log
+    # directories were moved above, so only the old processes.json and any
+    # loose or skipped files in data/logs remain; the full original layout
+    # survives only in the backup copytree made with _clone_or_copy.
+    print("Removing leftovers of the old structure...")
+    print("  Per-process log directories were moved, not copied; the original")
+    print(f"  layout is kept in the backup: {backup_dir}")
+    response = input(f"  Remove {old_processes_file} and what remains of {old_logs_dir}? [y/N]: ")
     if response.lower() == 'y':
         old_processes_file.unlink()
         if old_logs_dir.exists():
             shutil.rmtree(old_logs_dir)
-        print("✓ Old structure removed")
+        print("✓ Old leftovers removed")
     else:
-        print("  Keeping old structure (you can remove it manually later)")
+        print("  Keeping the old processes.json and remaining data/logs files")
+        print("  (you can remove them manually later; the backup holds the originals)")
 
     print()
     print("=" * 60)